@@ -1,51 +1,239 @@
 import discord
 from discord.ext import commands
-import psycopg2
+import asyncpg
 import os
 import asyncio
+import hashlib
 import logging
+import orjson
+from typing import Optional
+from dotenv import load_dotenv
 
+from app.database.connection import create_pool
 from app.database.tables import StocksTable, UserStockSubscriptionsTable
+from app.models.stock import normalize_ticker
+from app.services.http_session import get_shared_session
 from app.services.ticker_validator import TickerValidator
+from app.utils import TTLCache
+
+# Load environment variables
+load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Resolved once; the environment doesn't change while the bot runs
+FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
+
 intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
 
 bot = commands.Bot(command_prefix='!', intents=intents)
 
+# Shared connection pool, created once the bot is ready
+pool: Optional[asyncpg.Pool] = None
+
+# Shared Finnhub client, reused by every command
+ticker_validator: Optional[TickerValidator] = None
+
+
+async def init_db_pool() -> asyncpg.Pool:
+    """Create the shared connection pool if it doesn't exist yet"""
+    global pool
+    if pool is None:
+        pool = await create_pool(
+            min_size=5,
+            max_size=20,
+            max_inactive_connection_lifetime=300,
+            statement_cache_size=1024
+        )
+        logger.info("Database pool created")
+    return pool
+
+
+async def get_ticker_validator() -> TickerValidator:
+    """
+    Get the shared ticker validator, whose lookup cache lives for the
+    lifetime of the bot. It uses the process-wide HTTP session, which
+    main closes on shutdown.
+    """
+    global ticker_validator
+    if ticker_validator is None:
+        ticker_validator = TickerValidator(
+            FINNHUB_API_KEY,
+            session=get_shared_session()
+        )
+        await ticker_validator.__aenter__()
+    return ticker_validator
+
+
+async def close_resources() -> None:
+    """Close the shared connection pool and ticker validator"""
+    global pool, ticker_validator
+    if pool is not None:
+        await pool.close()
+        pool = None
+    if ticker_validator is not None:
+        await ticker_validator.close()
+        ticker_validator = None
+
+
+class Ticker(commands.Converter):
+    """Command argument converter that normalizes ticker symbols"""
+
+    async def convert(self, ctx, argument: str) -> str:
+        return normalize_ticker(argument)
 
-def get_db_connection():
-    return psycopg2.connect(
-        dbname=os.getenv("DB_NAME", "stock_analysis"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        host=os.getenv("DB_HOST", "localhost"),
-        port=os.getenv("DB_PORT", "5432"),
-    )
 
+class ConfirmView(discord.ui.View):
+    """
+    Confirm/cancel buttons for the command author. The choice resolves
+    `result` with True/False, or None if nobody answers in time.
+    """
 
-@bot.event
+    def __init__(self, author: discord.abc.User, timeout: float = 30.0):
+        super().__init__(timeout=timeout)
+        self.author = author
+        self.result: asyncio.Future = (
+            asyncio.get_running_loop().create_future()
+        )
+
+    async def interaction_check(
+        self,
+        interaction: discord.Interaction
+    ) -> bool:
+        return interaction.user.id == self.author.id
+
+    async def _resolve(
+        self,
+        interaction: discord.Interaction,
+        confirmed: bool
+    ) -> None:
+        if not self.result.done():
+            self.result.set_result(confirmed)
+        self.stop()
+        await interaction.response.edit_message(view=None)
+
+    @discord.ui.button(emoji="✅", style=discord.ButtonStyle.success)
+    async def confirm(self, interaction, button):
+        await self._resolve(interaction, True)
+
+    @discord.ui.button(emoji="❌", style=discord.ButtonStyle.danger)
+    async def cancel(self, interaction, button):
+        await self._resolve(interaction, False)
+
+    async def on_timeout(self) -> None:
+        if not self.result.done():
+            self.result.set_result(None)
+
+
+# (channel_id, user_id, command) -> (embed digest, message id) of last reply
+_last_sent = TTLCache(maxsize=4096, ttl=3600)
+
+
+def _embed_digest(embed: discord.Embed) -> bytes:
+    """Stable hash of an embed's content"""
+    payload = orjson.dumps(
+        embed.to_dict(),
+        option=orjson.OPT_SORT_KEYS,
+        default=str
+    )
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _is_latest_reply(ctx, message_id: int) -> bool:
+    """
+    Check whether message_id is the newest message in the channel apart
+    from the invoking command, using the client's local message cache.
+    """
+    for message in reversed(bot.cached_messages):
+        if message.channel.id != ctx.channel.id or message == ctx.message:
+            continue
+        return message.id == message_id
+    return False
+
+
+async def _send_embed(ctx, command: str, embed: discord.Embed) -> None:
+    """
+    Send an embed for a command, skipping the REST call when the user's
+    previous reply for that command is identical and still sits directly
+    above their new command.
+    """
+    key = (ctx.channel.id, ctx.author.id, command)
+    digest = _embed_digest(embed)
+
+    previous = _last_sent.get(key)
+    if previous is not None:
+        previous_digest, previous_message_id = previous
+        if (previous_digest == digest and
+                _is_latest_reply(ctx, previous_message_id)):
+            return
+
+    message = await ctx.send(embed=embed)
+    _last_sent.set(key, (digest, message.id))
+
+
+# Static responses are built once at import and shared by every invocation
+_EMPTY_MYSTOCKS_EMBED = discord.Embed(
+    title="📊 Your Subscribed Stocks",
+    description="You're not subscribed to any stocks yet.",
+    color=discord.Color.blue()
+).add_field(
+    name="Get started",
+    value="Use `!subscribe TICKER Company Name` to subscribe",
+    inline=False
+)
+
+# Copied per use; description and field are filled in with the ticker
+_STOCK_NOT_FOUND_TEMPLATE = discord.Embed(
+    title="❌ Stock Not Found",
+    color=discord.Color.red()
+).add_field(
+    name="Subscribe to track",
+    value="",
+    inline=False
+)
+
+
+# Registered as a listener so it isn't replaced by other on_ready handlers
+@bot.listen('on_ready')
 async def on_ready():
+    await init_db_pool()
+    if FINNHUB_API_KEY:
+        await get_ticker_validator()
+    else:
+        logger.error(
+            "FINNHUB_API_KEY not set - ticker validation and search "
+            "are disabled"
+        )
     logger.info(f'{bot.user} connected to {len(bot.guilds)} guilds')
 
 
 @bot.command(name='subscribe')
-async def subscribe(ctx, ticker: str, *, company_name: str = None):
+async def subscribe(ctx, ticker: Ticker, *, company_name: str = None):
     try:
-        ticker = ticker.upper()
         discord_id = str(ctx.author.id)
-        finnhub_key = os.getenv("FINNHUB_API_KEY")
-        if not finnhub_key:
-            await ctx.send(
-                "❌ Ticker validation unavailable. "
-                "Please provide company name: `!subscribe TICKER Company Name`"
-            )
-            return
 
-        async with TickerValidator(finnhub_key) as validator:
+        # Tickers someone already tracks are known good, so only ask
+        # Finnhub about tickers we haven't seen before
+        existing = await StocksTable(pool).find_one(
+            ("ticker", "company_name"),
+            ticker=ticker
+        )
+        ticker_info = None
+
+        if existing is not None:
+            actual_company = existing["company_name"]
+        else:
+            if not FINNHUB_API_KEY:
+                await ctx.send(
+                    "❌ Ticker validation unavailable. "
+                    "Please provide company name: "
+                    "`!subscribe TICKER Company Name`"
+                )
+                return
+
+            validator = await get_ticker_validator()
             ticker_info = await validator.validate_ticker(ticker)
 
             if not ticker_info:
@@ -57,86 +245,57 @@ async def subscribe(ctx, ticker: str, *, company_name: str = None):
 
             actual_company = ticker_info["company_name"]
 
-            if company_name:
-                verification = await validator.verify_match(
-                    ticker,
-                    company_name
+        if company_name:
+            verification = TickerValidator.match_company_name(
+                ticker,
+                company_name,
+                actual_company
+            )
+
+            if not verification["match"]:
+                embed = discord.Embed(
+                    title="⚠️ Company Name Mismatch",
+                    description=(
+                        f"The ticker **{ticker}** corresponds to:\n"
+                        f"**{actual_company}**\n\n"
+                        f"You entered: **{company_name}**"
+                    ),
+                    color=discord.Color.orange()
                 )
+                embed.add_field(
+                    name="Confirm subscription?",
+                    value=(
+                        f"Press ✅ to subscribe to **{ticker}** "
+                        f"({actual_company})\n"
+                        "Press ❌ to cancel"
+                    ),
+                    inline=False
+                )
+                view = ConfirmView(ctx.author)
+                msg = await ctx.send(embed=embed, view=view)
 
-                if not verification["match"]:
-                    embed = discord.Embed(
-                        title="⚠️ Company Name Mismatch",
-                        description=(
-                            f"The ticker **{ticker}** corresponds to:\n"
-                            f"**{actual_company}**\n\n"
-                            f"You entered: **{company_name}**"
-                        ),
-                        color=discord.Color.orange()
-                    )
-                    embed.add_field(
-                        name="Confirm subscription?",
-                        value=(
-                            f"React with ✅ to subscribe to **{ticker}** "
-                            f"({actual_company})\n"
-                            "React with ❌ to cancel"
-                        ),
-                        inline=False
+                confirmed = await view.result
+
+                if confirmed is None:
+                    await msg.edit(view=None)
+                    await ctx.send(
+                        "⏱️ Confirmation timeout. Subscription cancelled."
                     )
-                    msg = await ctx.send(embed=embed)
-                    await msg.add_reaction("✅")
-                    await msg.add_reaction("❌")
-
-                    def check(reaction, user):
-                        return (
-                            user == ctx.author and
-                            str(reaction.emoji) in ["✅", "❌"] and
-                            reaction.message.id == msg.id
-                        )
-
-                    try:
-                        reaction, user = await bot.wait_for(
-                            "reaction_add",
-                            timeout=30.0,
-                            check=check
-                        )
-
-                        if str(reaction.emoji) == "❌":
-                            await ctx.send("❌ Subscription cancelled.")
-                            return
-                    except asyncio.TimeoutError:
-                        await ctx.send(
-                            "⏱️ Confirmation timeout. Subscription cancelled."
-                        )
-                        return
-
-            company_name = actual_company
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        stocks_table = StocksTable(conn, cursor)
-        stock_exists = stocks_table.find_one(ticker=ticker)
-
-        if not stock_exists:
-            from app.models.stock import Stock
-            stock = Stock(
-                ticker=ticker,
-                company_name=company_name,
-                last_analysis_timestamp=None,
-                last_sentiment_score=None
-            )
-            stocks_table.upsert(stock)
+                    return
+                if not confirmed:
+                    await ctx.send("❌ Subscription cancelled.")
+                    return
 
-        subscriptions_table = UserStockSubscriptionsTable(conn, cursor)
-        success = subscriptions_table.subscribe(
+        company_name = actual_company
+
+        # Stock creation and subscription happen in one statement
+        subscriptions_table = UserStockSubscriptionsTable(pool)
+        success = await subscriptions_table.subscribe_with_stock(
             discord_id=discord_id,
             ticker=ticker,
             company_name=company_name
         )
 
-        cursor.close()
-        conn.close()
-
         if success:
             embed = discord.Embed(
                 title="✅ Subscribed!",
@@ -146,17 +305,18 @@ async def subscribe(ctx, ticker: str, *, company_name: str = None):
                 ),
                 color=discord.Color.green()
             )
-            embed.add_field(
-                name="Exchange",
-                value=ticker_info.get("exchange", "N/A"),
-                inline=True
-            )
-            if ticker_info.get("industry"):
+            if ticker_info:
                 embed.add_field(
-                    name="Industry",
-                    value=ticker_info["industry"],
+                    name="Exchange",
+                    value=ticker_info.get("exchange", "N/A"),
                     inline=True
                 )
+                if ticker_info.get("industry"):
+                    embed.add_field(
+                        name="Industry",
+                        value=ticker_info["industry"],
+                        inline=True
+                    )
             embed.add_field(
                 name="What's next?",
                 value=(
@@ -182,19 +342,16 @@ async def subscribe(ctx, ticker: str, *, company_name: str = None):
 
 
 @bot.command(name='unsubscribe')
-async def unsubscribe(ctx, ticker: str):
+async def unsubscribe(ctx, ticker: Ticker):
     try:
-        ticker = ticker.upper()
         discord_id = str(ctx.author.id)
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        subscriptions_table = UserStockSubscriptionsTable(conn, cursor)
-        success = subscriptions_table.unsubscribe(discord_id, ticker)
-
-        cursor.close()
-        conn.close()
+        async with pool.acquire() as conn:
+            subscriptions_table = UserStockSubscriptionsTable(conn)
+            success = await subscriptions_table.unsubscribe(
+                discord_id,
+                ticker
+            )
 
         if success:
             embed = discord.Embed(
@@ -223,17 +380,13 @@ async def mystocks(ctx):
     try:
         discord_id = str(ctx.author.id)
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        subscriptions_table = UserStockSubscriptionsTable(conn, cursor)
-        subscriptions = subscriptions_table.get_user_subscriptions(
-            discord_id
+        subscriptions_table = UserStockSubscriptionsTable(pool)
+        subscriptions = (
+            await subscriptions_table.get_user_subscriptions_with_info(
+                discord_id
+            )
         )
 
-        cursor.close()
-        conn.close()
-
         if subscriptions:
             embed = discord.Embed(
                 title="📊 Your Subscribed Stocks",
@@ -242,25 +395,18 @@ async def mystocks(ctx):
             )
 
             for sub in subscriptions:
+                value = sub['company_name']
+                if sub['last_sentiment_score'] is not None:
+                    value += f"\nSentiment: {sub['last_sentiment_score']:.3f}"
                 embed.add_field(
                     name=f"{sub['ticker']}",
-                    value=sub['company_name'],
+                    value=value,
                     inline=True
                 )
 
-            await ctx.send(embed=embed)
+            await _send_embed(ctx, 'mystocks', embed)
         else:
-            embed = discord.Embed(
-                title="📊 Your Subscribed Stocks",
-                description="You're not subscribed to any stocks yet.",
-                color=discord.Color.blue()
-            )
-            embed.add_field(
-                name="Get started",
-                value="Use `!subscribe TICKER Company Name` to subscribe",
-                inline=False
-            )
-            await ctx.send(embed=embed)
+            await _send_embed(ctx, 'mystocks', _EMPTY_MYSTOCKS_EMBED)
 
     except Exception as e:
         logger.error(f"Error in mystocks command: {e}")
@@ -270,18 +416,12 @@ async def mystocks(ctx):
 
 
 @bot.command(name='stockinfo')
-async def stockinfo(ctx, ticker: str):
+async def stockinfo(ctx, ticker: Ticker):
     try:
-        ticker = ticker.upper()
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        stocks_table = StocksTable(conn, cursor)
-        stock = stocks_table.find_one(ticker=ticker)
-
-        cursor.close()
-        conn.close()
+        # Query through the pool so cache hits never check out a connection
+        stocks_table = StocksTable(pool)
+        stock = await stocks_table.find_by_ticker(ticker)
 
         if stock and stock['last_analysis_timestamp']:
             # Determine sentiment color
@@ -322,7 +462,7 @@ async def stockinfo(ctx, ticker: str):
                 inline=False
             )
 
-            await ctx.send(embed=embed)
+            await _send_embed(ctx, 'stockinfo', embed)
         elif stock:
             embed = discord.Embed(
                 title=f"📊 {ticker} - {stock['company_name']}",
@@ -337,19 +477,17 @@ async def stockinfo(ctx, ticker: str):
                 ),
                 inline=False
             )
-            await ctx.send(embed=embed)
+            await _send_embed(ctx, 'stockinfo', embed)
         else:
-            embed = discord.Embed(
-                title="❌ Stock Not Found",
-                description=f"**{ticker}** is not being tracked yet.",
-                color=discord.Color.red()
-            )
-            embed.add_field(
+            embed = _STOCK_NOT_FOUND_TEMPLATE.copy()
+            embed.description = f"**{ticker}** is not being tracked yet."
+            embed.set_field_at(
+                0,
                 name="Subscribe to track",
                 value=f"Use `!subscribe {ticker} Company Name`",
                 inline=False
             )
-            await ctx.send(embed=embed)
+            await _send_embed(ctx, 'stockinfo', embed)
 
     except Exception as e:
         logger.error(f"Error in stockinfo command: {e}")
@@ -361,47 +499,45 @@ async def stockinfo(ctx, ticker: str):
 @bot.command(name='search')
 async def search(ctx, *, query: str):
     try:
-        finnhub_key = os.getenv("FINNHUB_API_KEY")
-        if not finnhub_key:
+        if not FINNHUB_API_KEY:
             await ctx.send("❌ Search unavailable - API key not configured.")
             return
 
-        async with TickerValidator(finnhub_key) as validator:
-            results = await validator.search_symbol(query)
-
-            if not results:
-                await ctx.send(
-                    f"❌ No results found for **{query}**. "
-                    "Try a different search term."
-                )
-                return
+        validator = await get_ticker_validator()
+        results = await validator.search_symbol(query)
 
-            embed = discord.Embed(
-                title=f"🔍 Search Results for '{query}'",
-                description=f"Found {len(results)} match(es)",
-                color=discord.Color.blue()
+        if not results:
+            await ctx.send(
+                f"❌ No results found for **{query}**. "
+                "Try a different search term."
             )
+            return
 
-            for result in results:
-                embed.add_field(
-                    name=f"{result['ticker']}",
-                    value=(
-                        f"{result['company_name']}\n"
-                        f"Type: {result['type']}\n"
-                        f"`!subscribe {result['ticker']}`"
-                    ),
-                    inline=False
-                )
+        embed = discord.Embed(
+            title=f"🔍 Search Results for '{query}'",
+            description=f"Found {len(results)} match(es)",
+            color=discord.Color.blue()
+        )
 
-            await ctx.send(embed=embed)
+        for result in results:
+            embed.add_field(
+                name=f"{result['ticker']}",
+                value=(
+                    f"{result['company_name']}\n"
+                    f"Type: {result['type']}\n"
+                    f"`!subscribe {result['ticker']}`"
+                ),
+                inline=False
+            )
+
+        await ctx.send(embed=embed)
 
     except Exception as e:
         logger.error(f"Error in search command: {e}", exc_info=True)
         await ctx.send("❌ Error performing search. Please try again later.")
 
 
-@bot.command(name='commands')
-async def commands_list(ctx):
+def _build_commands_embed() -> discord.Embed:
     embed = discord.Embed(
         title="📊 Stock Analysis Bot Commands",
         description="Track stocks and get sentiment analysis updates",
@@ -444,4 +580,13 @@ async def commands_list(ctx):
         inline=False
     )
 
-    await ctx.send(embed=embed)
+    return embed
+
+
+# The help text never changes, so the embed is shared by every invocation
+_COMMANDS_EMBED = _build_commands_embed()
+
+
+@bot.command(name='commands')
+async def commands_list(ctx):
+    await ctx.send(embed=_COMMANDS_EMBED)
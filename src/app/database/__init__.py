@@ -1,7 +1,9 @@
 """Database package for stock analysis bot"""
+from .connection import create_pool
 from .tables import StocksTable, UserStockSubscriptionsTable
 
 __all__ = [
+    "create_pool",
     "StocksTable",
     "UserStockSubscriptionsTable"
 ]
@@ -0,0 +1,46 @@
+"""Database connection helpers built on asyncpg"""
+import asyncpg
+import logging
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Connection settings, resolved once from the environment
+_CONNECTION_KWARGS = {
+    "database": os.getenv("DB_NAME", "stock_analysis"),
+    "user": os.getenv("DB_USER"),
+    "password": os.getenv("DB_PASSWORD"),
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": int(os.getenv("DB_PORT", "5432")),
+}
+
+if not _CONNECTION_KWARGS["user"]:
+    logger.error("DB_USER not set - database connections will fail")
+
+
+async def create_pool(
+    min_size: int = 5,
+    max_size: int = 20,
+    **kwargs
+) -> asyncpg.Pool:
+    """
+    Create a connection pool.
+
+    Args:
+        min_size: Connections opened up front and kept alive
+        max_size: Upper bound on concurrently open connections
+        **kwargs: Extra options forwarded to asyncpg.create_pool
+
+    Returns:
+        Initialized asyncpg pool
+    """
+    return await asyncpg.create_pool(
+        min_size=min_size,
+        max_size=max_size,
+        **_CONNECTION_KWARGS,
+        **kwargs
+    )
@@ -1,22 +1,85 @@
 """Database table abstractions for clean ORM-like operations"""
-import psycopg2
-from typing import Optional, Dict, Any, List
+import asyncio
+import asyncpg
+import hashlib
+from typing import Optional, Dict, List, Sequence
 from pydantic import BaseModel
 import logging
 from datetime import datetime
 
+from app.utils import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Stock rows only change when the analysis job runs, so point lookups
+# by ticker are served from memory for a short while.
+_stock_cache = TTLCache(maxsize=1024, ttl=60)
+_stock_lookups: Dict[str, asyncio.Task] = {}
+# Bumped whenever a stock row is written, so a lookup that read the row
+# before the write doesn't put the old version back in the cache
+_stock_generations: Dict[str, int] = {}
+_NOT_CACHED = object()
+
+
+def _invalidate_stock(ticker: str) -> None:
+    """Forget the cached row for ticker and any lookup in flight for it"""
+    _stock_cache.pop(ticker, None)
+    _stock_lookups.pop(ticker, None)
+    _stock_generations[ticker] = _stock_generations.get(ticker, 0) + 1
+
+
+def _subscription_hash(discord_id: str, ticker: str) -> str:
+    """16-char primary key for a subscription, from discord_id + ticker"""
+    hash_input = f"{discord_id}:{ticker}"
+    return hashlib.sha256(hash_input.encode()).hexdigest()[:16]
+
 
 class Table:
     """Base table class for database operations"""
 
-    def __init__(self, conn, cursor, table_name: str):
+    # Canonical SQL per operation. Keeping the query text stable lets
+    # asyncpg's per-connection statement cache reuse the server-side
+    # prepared statement instead of re-parsing and re-planning it.
+    QUERIES: Dict[str, str] = {}
+
+    # Generated find_* queries, keyed by (table, operation, columns)
+    _generated_queries: Dict[tuple, str] = {}
+
+    def __init__(self, conn, table_name: str):
+        # conn is an asyncpg Connection or Pool; both expose
+        # execute/fetch/fetchrow/fetchval. Statements autocommit unless
+        # the caller wraps them in conn.transaction().
         self.conn = conn
-        self.cursor = cursor
         self.table_name = table_name
 
-    def insert(
+    def _where_query(
+        self,
+        operation: str,
+        columns: Sequence[str],
+        keys: tuple
+    ) -> str:
+        """
+        Build (once) a SELECT of the given columns for the given
+        condition columns.
+        """
+        columns = tuple(columns)
+        cache_key = (self.table_name, operation, columns, keys)
+        query = self._generated_queries.get(cache_key)
+
+        if query is None:
+            query = f"SELECT {', '.join(columns)} FROM {self.table_name}"
+            if keys:
+                where_clause = ' AND '.join(
+                    [f"{k} = ${i}" for i, k in enumerate(keys, 1)]
+                )
+                query += f" WHERE {where_clause}"
+            if operation in ("find_one", "exists"):
+                query += " LIMIT 1"
+            self._generated_queries[cache_key] = query
+
+        return query
+
+    async def insert(
         self,
         model: BaseModel,
         on_conflict: Optional[str] = None
@@ -30,7 +93,9 @@ class Table:
 
             # Build INSERT query
             columns = ', '.join(data.keys())
-            placeholders = ', '.join(['%s'] * len(data))
+            placeholders = ', '.join(
+                f"${i}" for i in range(1, len(data) + 1)
+            )
             values = tuple(data.values())
 
             query = (
@@ -41,258 +106,332 @@ class Table:
             if on_conflict:
                 query += f" ON CONFLICT {on_conflict}"
 
-            self.cursor.execute(query, values)
-            self.conn.commit()
+            await self.conn.execute(query, *values)
 
             return True
 
-        except psycopg2.IntegrityError as e:
-            self.conn.rollback()
+        except asyncpg.IntegrityConstraintViolationError as e:
             logger.debug(
                 f"Integrity error inserting into {self.table_name}: {e}"
             )
             return False
         except Exception as e:
-            self.conn.rollback()
             logger.error(f"Error inserting into {self.table_name}: {e}")
             raise
 
-    def find_one(self, **conditions) -> Optional[Dict[str, Any]]:
+    async def find_one(
+        self,
+        columns: Sequence[str] = ("*",),
+        **conditions
+    ) -> Optional[asyncpg.Record]:
         """
-        Find a single row matching conditions.
+        Find a single row matching conditions, selecting only columns.
+        Records support item access by column name, like a dict.
         """
-        where_clause = ' AND '.join(
-            [f"{k} = %s" for k in conditions.keys()]
+        query = self._where_query(
+            "find_one",
+            columns,
+            tuple(conditions.keys())
         )
-        values = tuple(conditions.values())
 
-        query = (
-            f"SELECT * FROM {self.table_name} "
-            f"WHERE {where_clause} LIMIT 1"
-        )
-
-        self.cursor.execute(query, values)
-        result = self.cursor.fetchone()
+        return await self.conn.fetchrow(query, *conditions.values())
 
-        if result:
-            columns = [desc[0] for desc in self.cursor.description]
-            return dict(zip(columns, result))
+    async def find_many(
+        self,
+        columns: Sequence[str] = ("*",),
+        **conditions
+    ) -> List[asyncpg.Record]:
+        """
+        Find all rows matching conditions, selecting only columns.
+        """
+        query = self._where_query(
+            "find_many",
+            columns,
+            tuple(conditions.keys())
+        )
 
-        return None
+        return await self.conn.fetch(query, *conditions.values())
 
-    def find_many(self, **conditions) -> List[Dict[str, Any]]:
+    async def exists(self, **conditions) -> bool:
         """
-        Find all rows matching conditions.
+        Check whether any row matches conditions without fetching it.
         """
-        if conditions:
-            where_clause = ' AND '.join(
-                [f"{k} = %s" for k in conditions.keys()]
-            )
-            values = tuple(conditions.values())
-            query = (
-                f"SELECT * FROM {self.table_name} WHERE {where_clause}"
-            )
-            self.cursor.execute(query, values)
-        else:
-            query = f"SELECT * FROM {self.table_name}"
-            self.cursor.execute(query)
-
-        results = self.cursor.fetchall()
+        query = self._where_query(
+            "exists",
+            ("1",),
+            tuple(conditions.keys())
+        )
 
-        if results:
-            columns = [desc[0] for desc in self.cursor.description]
-            return [dict(zip(columns, row)) for row in results]
+        result = await self.conn.fetchval(query, *conditions.values())
 
-        return []
+        return result is not None
 
 
 class StocksTable(Table):
     """Stocks table with custom methods"""
 
-    def __init__(self, conn, cursor):
-        super().__init__(conn, cursor, "stock_analysis.stocks")
-
-    def upsert(self, model: BaseModel) -> bool:
+    COLUMNS = (
+        "ticker",
+        "company_name",
+        "last_sentiment_score",
+        "last_analysis_timestamp"
+    )
+
+    QUERIES = {
+        "upsert": """
+            INSERT INTO stock_analysis.stocks
+                (ticker, company_name, last_analysis_timestamp,
+                 last_sentiment_score)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (ticker)
+            DO UPDATE SET company_name = EXCLUDED.company_name,
+                          last_analysis_timestamp =
+                              EXCLUDED.last_analysis_timestamp,
+                          last_sentiment_score =
+                              EXCLUDED.last_sentiment_score
+        """,
+        # ticker is the primary key, so rows are already unique
+        "stocks_needing_analysis": """
+            SELECT ticker, company_name
+            FROM stock_analysis.stocks
+            WHERE last_analysis_timestamp IS NULL
+               OR last_analysis_timestamp
+                  < NOW() - make_interval(hours => $1)
+        """,
+    }
+
+    def __init__(self, conn):
+        super().__init__(conn, "stock_analysis.stocks")
+
+    async def upsert(self, model: BaseModel) -> bool:
         """
         Insert or update a stock's analysis results.
         """
         try:
-            data = model.model_dump()
+            await self.conn.execute(
+                self.QUERIES["upsert"],
+                model.ticker,
+                model.company_name,
+                model.last_analysis_timestamp,
+                model.last_sentiment_score
+            )
 
-            columns = ', '.join(data.keys())
-            placeholders = ', '.join(['%s'] * len(data))
-            values = tuple(data.values())
+            _invalidate_stock(model.ticker)
 
-            # Build update clause for all columns except ticker
-            update_cols = [k for k in data.keys() if k != 'ticker']
-            update_clause = ', '.join(
-                [f"{col} = EXCLUDED.{col}" for col in update_cols]
-            )
+            return True
 
-            query = f"""
-                INSERT INTO {self.table_name} ({columns})
-                VALUES ({placeholders})
-                ON CONFLICT (ticker)
-                DO UPDATE SET {update_clause}
-            """
+        except Exception as e:
+            logger.error(f"Error upserting into {self.table_name}: {e}")
+            raise
 
-            self.cursor.execute(query, values)
-            self.conn.commit()
+    async def upsert_many(self, models: List[BaseModel]) -> None:
+        """
+        Insert or update several stocks' analysis results in one batch.
+        """
+        if not models:
+            return
 
-            return True
+        try:
+            await self.conn.executemany(
+                self.QUERIES["upsert"],
+                [
+                    (
+                        model.ticker,
+                        model.company_name,
+                        model.last_analysis_timestamp,
+                        model.last_sentiment_score
+                    )
+                    for model in models
+                ]
+            )
+
+            for model in models:
+                _invalidate_stock(model.ticker)
 
         except Exception as e:
-            self.conn.rollback()
             logger.error(f"Error upserting into {self.table_name}: {e}")
             raise
 
-    def get_stocks_needing_analysis(
+    async def find_by_ticker(self, ticker: str) -> Optional[asyncpg.Record]:
+        """
+        Find a stock by ticker, served from the in-process cache when fresh.
+        Concurrent misses for the same ticker share a single query.
+        """
+        cached = _stock_cache.get(ticker, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached
+
+        lookup = _stock_lookups.get(ticker)
+        if lookup is None:
+            generation = _stock_generations.get(ticker, 0)
+            lookup = asyncio.ensure_future(
+                self.find_one(self.COLUMNS, ticker=ticker)
+            )
+            _stock_lookups[ticker] = lookup
+            try:
+                stock = await asyncio.shield(lookup)
+            finally:
+                # A write may already have replaced this lookup
+                if _stock_lookups.get(ticker) is lookup:
+                    del _stock_lookups[ticker]
+            if _stock_generations.get(ticker, 0) == generation:
+                _stock_cache.set(ticker, stock)
+            return stock
+
+        return await asyncio.shield(lookup)
+
+    async def get_stocks_needing_analysis(
         self,
         hours_threshold: int = 1
-    ) -> List[Dict[str, Any]]:
+    ) -> List[asyncpg.Record]:
         """
         Get stocks that need analysis (haven't been analyzed recently).
-        Returns list of {ticker, company_name} dicts.
+        Returns list of records with ticker and company_name.
+        Served by idx_stocks_stale as an index-only scan.
         """
-        query = f"""
-            SELECT DISTINCT s.ticker, s.company_name
-            FROM {self.table_name} s
-            WHERE s.last_analysis_timestamp IS NULL
-               OR s.last_analysis_timestamp < NOW() - INTERVAL '{hours_threshold} hours'
-        """
-
-        self.cursor.execute(query)
-        results = self.cursor.fetchall()
-
-        if results:
-            columns = [desc[0] for desc in self.cursor.description]
-            return [dict(zip(columns, row)) for row in results]
-
-        return []
+        return await self.conn.fetch(
+            self.QUERIES["stocks_needing_analysis"],
+            hours_threshold
+        )
 
 
 class UserStockSubscriptionsTable(Table):
     """User stock subscriptions table with custom methods"""
 
-    def __init__(self, conn, cursor):
-        super().__init__(conn, cursor, "stock_analysis.user_stock_subscriptions")
-
-    def subscribe(
+    QUERIES = {
+        # Creates the stock row if needed and the subscription in one
+        # statement; the FK check runs after the CTE's insert
+        "subscribe_with_stock": """
+            WITH new_stock AS (
+                INSERT INTO stock_analysis.stocks
+                    (ticker, company_name, last_analysis_timestamp,
+                     last_sentiment_score)
+                VALUES ($3, $4, NULL, NULL)
+                ON CONFLICT (ticker) DO NOTHING
+            )
+            INSERT INTO stock_analysis.user_stock_subscriptions
+                (hash, discord_id, ticker, company_name)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (hash) DO NOTHING
+            RETURNING hash
+        """,
+        "unsubscribe": """
+            DELETE FROM stock_analysis.user_stock_subscriptions
+            WHERE hash = $1
+            RETURNING hash
+        """,
+        "user_subscriptions_with_info": """
+            SELECT u.ticker, u.company_name,
+                   s.last_sentiment_score, s.last_analysis_timestamp
+            FROM stock_analysis.user_stock_subscriptions u
+            LEFT JOIN stock_analysis.stocks s ON s.ticker = u.ticker
+            WHERE u.discord_id = $1
+            ORDER BY u.ticker
+        """,
+        "all_tracked_tickers": """
+            SELECT DISTINCT ticker, company_name
+            FROM stock_analysis.user_stock_subscriptions
+            ORDER BY ticker
+        """,
+        "subscribers_for_tickers": """
+            SELECT ticker, discord_id
+            FROM stock_analysis.user_stock_subscriptions
+            WHERE ticker = ANY($1::text[])
+        """,
+    }
+
+    def __init__(self, conn):
+        super().__init__(conn, "stock_analysis.user_stock_subscriptions")
+
+    async def subscribe_with_stock(
         self,
         discord_id: str,
         ticker: str,
         company_name: str
     ) -> bool:
         """
-        Subscribe a user to a stock.
+        Subscribe a user to a stock, creating the stock row first if it
+        isn't tracked yet, in a single round-trip.
         Returns True if subscription was created, False if already exists.
-        Uses hash of discord_id+ticker as PRIMARY KEY.
         """
         try:
-            import hashlib
-            
-            # Create 16-char hash from discord_id + ticker
-            hash_input = f"{discord_id}:{ticker}"
-            full_hash = hashlib.sha256(hash_input.encode()).hexdigest()
-            hash_value = full_hash[:16]  # Take first 16 characters
-
-            query = f"""
-                INSERT INTO {self.table_name}
-                    (hash, discord_id, ticker, company_name)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (hash) DO NOTHING
-                RETURNING hash
-            """
-
-            self.cursor.execute(
-                query,
-                (hash_value, discord_id, ticker, company_name)
+            result = await self.conn.fetchval(
+                self.QUERIES["subscribe_with_stock"],
+                _subscription_hash(discord_id, ticker),
+                discord_id,
+                ticker,
+                company_name
             )
-            result = self.cursor.fetchone()
-            self.conn.commit()
 
-            # If result is None, subscription already existed
+            if result is not None:
+                _invalidate_stock(ticker)
+
             return result is not None
 
         except Exception as e:
-            self.conn.rollback()
             logger.error(
                 f"Error subscribing user {discord_id} to {ticker}: {e}"
             )
             raise
 
-    def unsubscribe(self, discord_id: str, ticker: str) -> bool:
+    async def unsubscribe(self, discord_id: str, ticker: str) -> bool:
         """
         Unsubscribe a user from a stock.
         Returns True if subscription was removed, False if didn't exist.
         """
         try:
-            import hashlib
-            
-            # Create 16-char hash from discord_id + ticker
-            hash_input = f"{discord_id}:{ticker}"
-            full_hash = hashlib.sha256(hash_input.encode()).hexdigest()
-            hash_value = full_hash[:16]  # Take first 16 characters
-
-            query = f"""
-                DELETE FROM {self.table_name}
-                WHERE hash = %s
-                RETURNING hash
-            """
-
-            self.cursor.execute(query, (hash_value,))
-            result = self.cursor.fetchone()
-            self.conn.commit()
+            hash_value = _subscription_hash(discord_id, ticker)
+
+            result = await self.conn.fetchval(
+                self.QUERIES["unsubscribe"],
+                hash_value
+            )
 
             return result is not None
 
         except Exception as e:
-            self.conn.rollback()
             logger.error(
                 f"Error unsubscribing user {discord_id} from {ticker}: {e}"
             )
             raise
 
-    def get_user_subscriptions(
+    async def get_user_subscriptions_with_info(
         self,
         discord_id: str
-    ) -> List[Dict[str, Any]]:
+    ) -> List[asyncpg.Record]:
         """
-        Get all stocks a user is subscribed to.
+        Get a user's subscriptions together with each stock's latest
+        analysis in a single query.
+        Returns list of records with ticker, company_name,
+        last_sentiment_score and last_analysis_timestamp.
         """
-        return self.find_many(discord_id=discord_id)
+        return await self.conn.fetch(
+            self.QUERIES["user_subscriptions_with_info"],
+            discord_id
+        )
 
-    def get_subscribers_for_ticker(self, ticker: str) -> List[str]:
-        """
-        Get all discord_ids subscribed to a specific ticker.
+    async def get_subscribers_for_tickers(
+        self,
+        tickers: List[str]
+    ) -> Dict[str, List[str]]:
         """
-        query = f"""
-            SELECT discord_id
-            FROM {self.table_name}
-            WHERE ticker = %s
+        Get discord_ids subscribed to each of several tickers in one query.
+        Returns dict of ticker -> list of discord_ids.
         """
+        results = await self.conn.fetch(
+            self.QUERIES["subscribers_for_tickers"],
+            tickers
+        )
 
-        self.cursor.execute(query, (ticker,))
-        results = self.cursor.fetchall()
+        subscribers: Dict[str, List[str]] = {}
+        for row in results:
+            subscribers.setdefault(row['ticker'], []).append(row['discord_id'])
 
-        return [row[0] for row in results] if results else []
+        return subscribers
 
-    def get_all_tracked_tickers(self) -> List[Dict[str, Any]]:
+    async def get_all_tracked_tickers(self) -> List[asyncpg.Record]:
         """
         Get all unique tickers being tracked by any user.
-        Returns list of {ticker, company_name} dicts.
-        """
-        query = f"""
-            SELECT DISTINCT ticker, company_name
-            FROM {self.table_name}
-            ORDER BY ticker
+        Returns list of records with ticker and company_name.
         """
-
-        self.cursor.execute(query)
-        results = self.cursor.fetchall()
-
-        if results:
-            columns = [desc[0] for desc in self.cursor.description]
-            return [dict(zip(columns, row)) for row in results]
-
-        return []
+        return await self.conn.fetch(self.QUERIES["all_tracked_tickers"])
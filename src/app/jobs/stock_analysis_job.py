@@ -1,3 +1,4 @@
+import functools
 from typing import Dict, Any, Optional
 from interfaces import Job
 from app.services import (
@@ -9,11 +10,44 @@ from app.services import (
     TextSummarizer
 )
 from app.models import NewsArticle
+import hashlib
+import numpy as np
 import os
 from logging import getLogger
 
 logger = getLogger(__name__)
 
+# Titles whose 64-bit SimHashes differ in at most this many bits are
+# treated as the same story
+SIMHASH_MAX_DISTANCE = 3
+# 4 x 16-bit bands: hashes within 3 bits must agree on at least one band
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = 16
+
+
+def _simhash(title: str) -> int:
+    """
+    64-bit SimHash over a title's word trigrams (or the whole title when
+    it has fewer than three words).
+    """
+    words = title.casefold().split()
+    shingles = [
+        " ".join(words[i:i + 3])
+        for i in range(max(len(words) - 2, 1))
+    ]
+
+    weights = [0] * 64
+    for shingle in shingles:
+        digest = hashlib.blake2b(shingle.encode(), digest_size=8).digest()
+        shingle_hash = int.from_bytes(digest, "big")
+        for bit in range(64):
+            if shingle_hash >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
 
 class StockAnalysisJob(Job):
     """
@@ -26,57 +60,82 @@ class StockAnalysisJob(Job):
         ticker: str,
         company_name: str,
         newsapi_key: str,
-        finnhub_key: str
+        finnhub_key: str,
+        sentiment_analyzer: Optional[SentimentAnalyzer] = None,
+        text_summarizer: Optional[TextSummarizer] = None,
+        news_scraper: Optional[NewsScraper] = None,
+        yahoo_scraper: Optional[YahooFinanceScraper] = None,
+        finnhub_scraper: Optional[FinnhubScraper] = None,
+        content_fetcher: Optional[ArticleContentFetcher] = None,
+        serialize_articles: bool = True
     ):
         super().__init__(job_id)
         self.ticker = ticker
         self.company_name = company_name
         self.newsapi_key = newsapi_key
         self.finnhub_key = finnhub_key
-        self.news_scraper: Optional[NewsScraper] = None
-        self.yahoo_scraper: Optional[YahooFinanceScraper] = None
-        self.finnhub_scraper: Optional[FinnhubScraper] = None
-        self.content_fetcher: Optional[ArticleContentFetcher] = None
-        self.sentiment_analyzer: Optional[SentimentAnalyzer] = None
-        self.text_summarizer: Optional[TextSummarizer] = None
+        # Scrapers, fetcher and analyzers may be shared across jobs so
+        # sessions are set up and models loaded only once; any left out
+        # are created (and cleaned up) by this job
+        self.news_scraper: Optional[NewsScraper] = news_scraper
+        self.yahoo_scraper: Optional[YahooFinanceScraper] = yahoo_scraper
+        self.finnhub_scraper: Optional[FinnhubScraper] = finnhub_scraper
+        self.content_fetcher: Optional[ArticleContentFetcher] = (
+            content_fetcher
+        )
+        self.sentiment_analyzer: Optional[SentimentAnalyzer] = (
+            sentiment_analyzer
+        )
+        self.text_summarizer: Optional[TextSummarizer] = text_summarizer
+        self._owned_scrapers: list = []
+        # Whether the result includes per-article details; callers that
+        # only need the aggregate can skip building them
+        self.serialize_articles = serialize_articles
         self.articles: list[NewsArticle] = []
+        # SimHash band -> title hashes of the articles kept so far
+        self._title_buckets: Dict[tuple, list[int]] = {}
 
     async def setup_resources(self) -> None:
         """
         Setup resources needed for stock analysis.
         Initialize news scraper, sentiment analyzer, summarizer, etc.
         """
-        logger.info(f"Setting up resources for {self.ticker}")
-        self.news_scraper = NewsScraper(self.newsapi_key)
-        await self.news_scraper.__aenter__()
-        
-        self.yahoo_scraper = YahooFinanceScraper()
-        await self.yahoo_scraper.__aenter__()
-
-        self.finnhub_scraper = FinnhubScraper(self.finnhub_key)
-        await self.finnhub_scraper.__aenter__()
-        
-        self.content_fetcher = ArticleContentFetcher(max_concurrent=5)
-        await self.content_fetcher.__aenter__()
-
-        self.sentiment_analyzer = SentimentAnalyzer()
-        # Model will be loaded on first use
-
-        self.text_summarizer = TextSummarizer()
-        # Model will be loaded on first use
+        logger.info("Setting up resources for %s", self.ticker)
+        if self.news_scraper is None:
+            self.news_scraper = NewsScraper(self.newsapi_key)
+            await self.news_scraper.__aenter__()
+            self._owned_scrapers.append(self.news_scraper)
+
+        if self.yahoo_scraper is None:
+            self.yahoo_scraper = YahooFinanceScraper()
+            await self.yahoo_scraper.__aenter__()
+            self._owned_scrapers.append(self.yahoo_scraper)
+
+        if self.finnhub_scraper is None:
+            self.finnhub_scraper = FinnhubScraper(self.finnhub_key)
+            await self.finnhub_scraper.__aenter__()
+            self._owned_scrapers.append(self.finnhub_scraper)
+
+        if self.content_fetcher is None:
+            self.content_fetcher = ArticleContentFetcher(max_concurrent=5)
+            await self.content_fetcher.__aenter__()
+            self._owned_scrapers.append(self.content_fetcher)
+
+        if self.sentiment_analyzer is None:
+            self.sentiment_analyzer = SentimentAnalyzer()
+            # Model will be loaded on first use
+
+        if self.text_summarizer is None:
+            self.text_summarizer = TextSummarizer()
+            # Model will be loaded on first use
 
         self.register_cleanup(self._cleanup_scrapers)
 
     async def _cleanup_scrapers(self) -> None:
-        """Cleanup all scrapers."""
-        if self.news_scraper:
-            await self.news_scraper.close()
-        if self.yahoo_scraper:
-            await self.yahoo_scraper.close()
-        if self.finnhub_scraper:
-            await self.finnhub_scraper.close()
-        if self.content_fetcher:
-            await self.content_fetcher.close()
+        """Cleanup the scrapers this job created."""
+        for scraper in self._owned_scrapers:
+            await scraper.close()
+        self._owned_scrapers = []
 
     async def cleanup_resources(self) -> None:
         """
@@ -88,7 +147,7 @@ class StockAnalysisJob(Job):
         """
         Pre-run validation and setup.
         """
-        logger.info(f"Starting analysis for ticker: {self.ticker}")
+        logger.info("Starting analysis for ticker: %s", self.ticker)
 
     async def post_run_hook(self) -> None:
         """
@@ -97,31 +156,38 @@ class StockAnalysisJob(Job):
         # TODO: Send notifications, store results, etc.
         pass
 
-    def _deduplicate_articles(
-        self,
-        articles: list[NewsArticle]
-    ) -> list[NewsArticle]:
+    def _add_unique(self, articles: list[NewsArticle]) -> None:
         """
-        Remove duplicate articles based on title similarity.
+        Append articles to self.articles, skipping any whose title is a
+        near-duplicate of one already kept. Near-duplicate titles are
+        found by SimHash distance, with the hashes of kept articles
+        indexed by band so each new article is only compared against
+        candidates sharing a band.
 
         Args:
-            articles: List of articles to deduplicate
-
-        Returns:
-            Deduplicated list of articles
+            articles: Newly fetched articles from one source
         """
-        seen_titles = set()
-        unique_articles = []
+        band_mask = (1 << SIMHASH_BAND_BITS) - 1
+        buckets = self._title_buckets
 
         for article in articles:
-            # Normalize title for comparison
-            normalized_title = article.title.lower().strip()
-
-            if normalized_title not in seen_titles:
-                seen_titles.add(normalized_title)
-                unique_articles.append(article)
+            title_hash = _simhash(article.title)
+            bands = [
+                (i, title_hash >> (i * SIMHASH_BAND_BITS) & band_mask)
+                for i in range(SIMHASH_BANDS)
+            ]
+
+            is_duplicate = any(
+                (title_hash ^ seen).bit_count() <= SIMHASH_MAX_DISTANCE
+                for band in bands
+                for seen in buckets.get(band, ())
+            )
+            if is_duplicate:
+                continue
 
-        return unique_articles
+            for band in bands:
+                buckets.setdefault(band, []).append(title_hash)
+            self.articles.append(article)
 
     async def run_implementation(self) -> Dict[str, Any]:
         """
@@ -130,63 +196,104 @@ class StockAnalysisJob(Job):
         2. Analyze sentiment
         3. Generate summary
         """
-        # Step 1: Scrape news articles from NewsAPI
+        await self._collect_articles()
+
+        sentiment_scores = None
+        if self.articles and self.sentiment_analyzer:
+            logger.info("Analyzing sentiment...")
+            sentiment_scores = (
+                await self.sentiment_analyzer.score_articles_async(
+                    self.articles
+                )
+            )
+
+        return await self.build_result(sentiment_scores)
+
+    async def collect_articles(self) -> list[NewsArticle]:
+        """
+        Scrape news and fetch article content without analyzing it, so
+        the caller can run sentiment analysis over several tickers'
+        articles at once. Sets up and cleans up scraper resources.
+        """
+        async with self._resource_context():
+            return await self._collect_articles()
+
+    async def _collect_articles(self) -> list[NewsArticle]:
+        """
+        Scrape news from NewsAPI with Yahoo Finance and Finnhub as
+        fallbacks, then fetch full article content.
+        """
+        # Step 1: Scrape news articles from NewsAPI, with Yahoo Finance
+        # and Finnhub as fallbacks
         if not self.news_scraper:
             raise RuntimeError("News scraper not initialized")
 
-        self.articles = await self.news_scraper.search_news(
-            ticker=self.ticker,
-            company_name=self.company_name,
-            hours_back=12,
-            max_articles=15
-        )
-
-        logger.info(
-            f"NewsAPI returned {len(self.articles)} articles for "
-            f"{self.ticker}"
-        )
+        self.articles = []
+        self._title_buckets = {}
 
-        # Step 2: Fallback to Yahoo Finance if insufficient articles
-        min_articles = 5
-        if len(self.articles) < min_articles and self.yahoo_scraper:
-            logger.info(
-                f"Insufficient articles from NewsAPI, trying Yahoo Finance"
-            )
-            yahoo_articles = await self.yahoo_scraper.search_news(
+        # Fallbacks are only queried when the sources before them came
+        # back short, so a ticker NewsAPI covers costs one request
+        sources = [(
+            "NewsAPI",
+            functools.partial(
+                self.news_scraper.search_news,
                 ticker=self.ticker,
+                company_name=self.company_name,
                 hours_back=12,
                 max_articles=15
             )
-            
-            logger.info(
-                f"Yahoo Finance returned {len(yahoo_articles)} articles"
-            )
-            
-            # Combine and deduplicate articles
-            self.articles.extend(yahoo_articles)
-            self.articles = self._deduplicate_articles(self.articles)
+        )]
+        if self.yahoo_scraper:
+            sources.append((
+                "Yahoo Finance",
+                functools.partial(
+                    self.yahoo_scraper.search_news,
+                    ticker=self.ticker,
+                    hours_back=12,
+                    max_articles=15
+                )
+            ))
+        if self.finnhub_scraper:
+            sources.append((
+                "Finnhub",
+                functools.partial(
+                    self.finnhub_scraper.search_news,
+                    ticker=self.ticker,
+                    hours_back=12,
+                    max_articles=15
+                )
+            ))
+
+        # Step 2: Take sources in priority order until we have enough
+        min_articles = 5
+        for name, search in sources:
+            # A failing source shouldn't lose the others' articles
+            try:
+                new_articles = await search()
+            except Exception as e:
+                logger.warning(
+                    "%s failed for %s: %s",
+                    name,
+                    self.ticker,
+                    e
+                )
+                continue
 
-        # Step 2b: Fallback to Finnhub if still insufficient
-        if len(self.articles) < min_articles and self.finnhub_scraper:
-            logger.info(
-                f"Still insufficient articles, trying Finnhub"
-            )
-            finnhub_articles = await self.finnhub_scraper.search_news(
-                ticker=self.ticker,
-                hours_back=12,
-                max_articles=15
-            )
-            
             logger.info(
-                f"Finnhub returned {len(finnhub_articles)} articles"
+                "%s returned %d articles for %s",
+                name,
+                len(new_articles),
+                self.ticker
             )
-            
-            # Combine and deduplicate articles
-            self.articles.extend(finnhub_articles)
-            self.articles = self._deduplicate_articles(self.articles)
+            self._add_unique(new_articles)
+
+            if len(self.articles) >= min_articles:
+                break
 
         logger.info(
-            f"Total: {len(self.articles)} articles for {self.ticker}"
+            "Total: %d articles for %s",
+            len(self.articles),
+            self.ticker
         )
 
         # Step 3: Fetch full article content
@@ -196,22 +303,31 @@ class StockAnalysisJob(Job):
                 self.articles
             )
 
-        # Step 4: Analyze sentiment
-        sentiment_results = []
-        if self.articles and self.sentiment_analyzer:
-            logger.info("Analyzing sentiment...")
-            sentiment_results = self.sentiment_analyzer.analyze_multiple(
-                self.articles
-            )
+        return self.articles
+
+    async def build_result(
+        self,
+        sentiment_scores: Optional[np.ndarray]
+    ) -> Dict[str, Any]:
+        """
+        Aggregate sentiment for the collected articles, generate the
+        summary and build the job result.
 
+        Args:
+            sentiment_scores: Label probabilities from score_articles,
+                one row per article in the same order as self.articles
+        """
+        # Step 4: Aggregate sentiment
+        if sentiment_scores is not None and len(sentiment_scores):
             # Aggregate overall sentiment
             sentiment_label, sentiment_score = (
-                self.sentiment_analyzer.aggregate_sentiment(sentiment_results)
+                self.sentiment_analyzer.aggregate_scores(sentiment_scores)
             )
 
             logger.info(
-                f"Overall sentiment: {sentiment_label} "
-                f"(score: {sentiment_score:.3f})"
+                "Overall sentiment: %s (score: %.3f)",
+                sentiment_label,
+                sentiment_score
             )
         else:
             sentiment_score = 0.0
@@ -220,35 +336,39 @@ class StockAnalysisJob(Job):
         # Step 5: Generate summary
         if self.articles and self.text_summarizer:
             logger.info("Generating summary...")
-            summary = self.text_summarizer.create_brief_summary(
+            summary = await self.text_summarizer.create_brief_summary_async(
                 self.articles,
                 sentiment_label,
                 sentiment_score
             )
-            logger.info(f"Summary generated: {len(summary)} chars")
+            logger.info("Summary generated: %d chars", len(summary))
         else:
             summary = "No articles available for summarization."
 
-        # Convert articles to dict format for JSON serialization
-        articles_data = [
-            {
-                "title": article.title,
-                "source": article.source,
-                "url": article.url,
-                "published_at": article.published_at.isoformat(),
-                "has_content": bool(article.content and len(article.content) > 100),
-                "content_preview": (
-                    article.content[:200] if article.content else None
-                )
-            }
-            for article in self.articles
-        ]
-
-        return {
+        result = {
             "ticker": self.ticker,
             "articles_found": len(self.articles),
             "sentiment_score": sentiment_score,
             "sentiment_label": sentiment_label,
-            "summary": summary,
-            "articles": articles_data
+            "summary": summary
         }
+
+        if self.serialize_articles:
+            # Convert articles to dict format for JSON serialization
+            result["articles"] = [
+                {
+                    "title": article.title,
+                    "source": article.source,
+                    "url": article.url,
+                    "published_at": article.published_at.isoformat(),
+                    "has_content": bool(
+                        article.content and len(article.content) > 100
+                    ),
+                    "content_preview": (
+                        article.content[:200] if article.content else None
+                    )
+                }
+                for article in self.articles
+            ]
+
+        return result
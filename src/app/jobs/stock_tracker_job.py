@@ -1,29 +1,47 @@
 """Job that analyzes all tracked stocks and sends notifications"""
+import aiohttp
 import asyncio
-from typing import Dict, Any, List
-import logging
-import psycopg2
+import numpy as np
 import os
+from typing import Dict, Any, List, Optional, Tuple
+import logging
 from datetime import datetime
 from dotenv import load_dotenv
 import discord
 
 from interfaces.job import Job
 from app.jobs.stock_analysis_job import StockAnalysisJob
+from app.database.connection import create_pool
 from app.database.tables import StocksTable, UserStockSubscriptionsTable
 from app.models.stock import Stock
+from app.services import (
+    NewsScraper,
+    YahooFinanceScraper,
+    FinnhubScraper,
+    ArticleContentFetcher,
+    SentimentAnalyzer,
+    TextSummarizer
+)
+from app.services.http_session import create_shared_session
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Tickers scraped at once; bounded to stay under news API rate limits
+TRACKER_CONCURRENCY = int(os.getenv("TRACKER_CONCURRENCY", "4"))
+
+# DMs in flight per ticker; discord.py handles the per-route rate limits
+NOTIFICATION_CONCURRENCY = 5
+
 
 class StockTrackerJob(Job):
     """
     Job that:
     1. Gets all tracked tickers from database
-    2. Runs analysis for each ticker
+    2. Fetches articles for every ticker, then runs sentiment analysis
+       over all of them in one batch
     3. Saves results to database
     4. Sends notifications to subscribed users
     """
@@ -33,48 +51,92 @@ class StockTrackerJob(Job):
         job_id: str = "stock_tracker_job",
         newsapi_key: str = None,
         finnhub_key: str = None,
-        bot=None
+        bot=None,
+        http_session: Optional[aiohttp.ClientSession] = None
     ):
         super().__init__(job_id)
         self.newsapi_key = newsapi_key
         self.finnhub_key = finnhub_key
         self.bot = bot
-        self.conn = None
-        self.cursor = None
+        self.pool = None
+        # A session passed in outlives the run and is left open
+        self.http_session = http_session
+        self._owns_http_session = http_session is None
+        self.news_scraper: Optional[NewsScraper] = None
+        self.yahoo_scraper: Optional[YahooFinanceScraper] = None
+        self.finnhub_scraper: Optional[FinnhubScraper] = None
+        self.content_fetcher: Optional[ArticleContentFetcher] = None
+        self.sentiment_analyzer: Optional[SentimentAnalyzer] = None
+        self.text_summarizer: Optional[TextSummarizer] = None
 
     async def setup_resources(self) -> None:
-        """Setup database connection"""
-        self.conn = psycopg2.connect(
-            dbname=os.getenv("DB_NAME", "stock_analysis"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            host=os.getenv("DB_HOST", "localhost"),
-            port=os.getenv("DB_PORT", "5432"),
-        )
-        self.cursor = self.conn.cursor()
+        """Setup database pool and the shared analyzer models"""
+        # A pool lets per-ticker writes run concurrently
+        self.pool = await create_pool(min_size=2, max_size=10)
+
+        # Loaded once and shared by every ticker's analysis; kept across
+        # runs when the job is reused, along with their worker threads
+        if self.sentiment_analyzer is None:
+            self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment_analyzer.load_model()
+        if self.text_summarizer is None:
+            self.text_summarizer = TextSummarizer()
+        self.text_summarizer.load_model()
 
         # Initialize table abstractions
-        self.stocks_table = StocksTable(self.conn, self.cursor)
-        self.subscriptions_table = UserStockSubscriptionsTable(
-            self.conn,
-            self.cursor
-        )
+        self.stocks_table = StocksTable(self.pool)
+        self.subscriptions_table = UserStockSubscriptionsTable(self.pool)
+
+        # One HTTP session and one set of scrapers for all tickers; the
+        # scrapers don't own the session, so closing it is enough
+        if self.http_session is None:
+            self.http_session = create_shared_session()
+            self._owns_http_session = True
+        # A reused job keeps its scrapers, still bound to that session
+        if self.news_scraper is None:
+            self.news_scraper = NewsScraper(
+                self.newsapi_key,
+                session=self.http_session
+            )
+            self.yahoo_scraper = YahooFinanceScraper(
+                session=self.http_session
+            )
+            self.finnhub_scraper = FinnhubScraper(
+                self.finnhub_key,
+                session=self.http_session
+            )
+            self.content_fetcher = ArticleContentFetcher(
+                max_concurrent=5,
+                session=self.http_session
+            )
 
         # Register cleanup
-        self.register_cleanup(self._close_db_connection)
-
-    def _close_db_connection(self) -> None:
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
+        self.register_cleanup(self._close_db_pool)
+        self.register_cleanup(self._close_http_session)
+
+    async def _close_db_pool(self) -> None:
+        """Close database pool"""
+        if self.pool:
+            await self.pool.close()
+
+    async def _close_http_session(self) -> None:
+        """Close the shared HTTP session if this job created it"""
+        if self.http_session and self._owns_http_session:
+            await self.http_session.close()
+            # The next run opens a new session and scrapers to go with it
+            self.http_session = None
+            self.news_scraper = None
+            self.yahoo_scraper = None
+            self.finnhub_scraper = None
+            self.content_fetcher = None
 
     async def run_implementation(self) -> Dict[str, Any]:
         """Run analysis for all tracked stocks"""
         # Get all tracked tickers
-        tracked_tickers = self.subscriptions_table.get_all_tracked_tickers()
-        logger.info(f"Found {len(tracked_tickers)} tracked tickers")
+        tracked_tickers = (
+            await self.subscriptions_table.get_all_tracked_tickers()
+        )
+        logger.info("Found %d tracked tickers", len(tracked_tickers))
 
         if not tracked_tickers:
             return {
@@ -83,74 +145,115 @@ class StockTrackerJob(Job):
                 "message": "No tracked tickers"
             }
 
-        results = []
-        notifications_sent = 0
+        # Look up subscribers for every ticker in a single query
+        subscribers = (
+            await self.subscriptions_table.get_subscribers_for_tickers(
+                [stock_info['ticker'] for stock_info in tracked_tickers]
+            )
+        )
+
+        analysis_jobs = [
+            StockAnalysisJob(
+                job_id=f"analysis_{stock_info['ticker']}",
+                ticker=stock_info['ticker'],
+                company_name=stock_info['company_name'],
+                newsapi_key=self.newsapi_key,
+                finnhub_key=self.finnhub_key,
+                sentiment_analyzer=self.sentiment_analyzer,
+                text_summarizer=self.text_summarizer,
+                news_scraper=self.news_scraper,
+                yahoo_scraper=self.yahoo_scraper,
+                finnhub_scraper=self.finnhub_scraper,
+                content_fetcher=self.content_fetcher,
+                # Notifications only use the aggregate result
+                serialize_articles=False
+            )
+            for stock_info in tracked_tickers
+        ]
 
-        for stock_info in tracked_tickers:
-            ticker = stock_info['ticker']
-            company_name = stock_info['company_name']
+        # Phase 1: scrape and fetch articles for several tickers at a time
+        semaphore = asyncio.Semaphore(TRACKER_CONCURRENCY)
 
-            try:
-                logger.info(f"Analyzing {ticker}...")
+        async def collect_guarded(job: StockAnalysisJob):
+            async with semaphore:
+                return await job.collect_articles()
 
-                # Run stock analysis
-                analysis_job = StockAnalysisJob(
-                    job_id=f"analysis_{ticker}",
-                    ticker=ticker,
-                    company_name=company_name,
-                    newsapi_key=self.newsapi_key,
-                    finnhub_key=self.finnhub_key
+        collected = await asyncio.gather(
+            *(collect_guarded(job) for job in analysis_jobs),
+            return_exceptions=True
+        )
+
+        # Phase 2: analyze every ticker's articles in one batch, keeping
+        # each ticker's slice of the combined list
+        all_articles = []
+        spans = []
+        for articles in collected:
+            start = len(all_articles)
+            if not isinstance(articles, BaseException):
+                all_articles.extend(articles)
+            spans.append((start, len(all_articles)))
+
+        sentiment_scores = np.empty((0, 3), dtype=np.float32)
+        if all_articles:
+            logger.info(
+                "Analyzing sentiment for %d articles across %d tickers",
+                len(all_articles),
+                len(analysis_jobs)
+            )
+            sentiment_scores = (
+                await self.sentiment_analyzer.score_articles_async(
+                    all_articles
                 )
+            )
 
-                result = await analysis_job.execute()
-
-                if result['status'] == 'COMPLETED':
-                    job_result = result['result']
-
-                    # Save to database
-                    stock = Stock(
-                        ticker=ticker,
-                        company_name=company_name,
-                        last_analysis_timestamp=datetime.now(),
-                        last_sentiment_score=job_result['sentiment_score']
-                    )
-                    self.stocks_table.upsert(stock)
-
-                    # Send notifications to subscribers
-                    if self.bot:
-                        sent = await self._send_notifications(
-                            ticker,
-                            company_name,
-                            job_result
-                        )
-                        notifications_sent += sent
-
-                    results.append({
-                        "ticker": ticker,
-                        "status": "success",
-                        "sentiment": job_result['sentiment_label'],
-                        "articles": job_result['articles_found']
-                    })
-
-                    logger.info(
-                        f"✓ {ticker}: {job_result['sentiment_label']} "
-                        f"({job_result['articles_found']} articles)"
-                    )
-                else:
-                    results.append({
-                        "ticker": ticker,
-                        "status": "failed",
-                        "error": result.get('error', 'Unknown error')
-                    })
-                    logger.error(f"✗ {ticker}: {result.get('error')}")
-
-            except Exception as e:
-                logger.error(f"Error analyzing {ticker}: {e}")
-                results.append({
-                    "ticker": ticker,
-                    "status": "error",
-                    "error": str(e)
-                })
+        # Phase 3: aggregate and summarize each ticker
+        results = []
+        completed = []
+        for analysis_job, articles, (start, end) in zip(
+            analysis_jobs,
+            collected,
+            spans
+        ):
+            result, job_result = await self._build_ticker_result(
+                analysis_job,
+                articles,
+                sentiment_scores[start:end]
+            )
+            results.append(result)
+            if job_result is not None:
+                completed.append((analysis_job, result, job_result))
+
+        # Phase 4: save every ticker's analysis in one round-trip
+        try:
+            await self.stocks_table.upsert_many([
+                Stock(
+                    ticker=analysis_job.ticker,
+                    company_name=analysis_job.company_name,
+                    last_analysis_timestamp=datetime.now(),
+                    last_sentiment_score=job_result['sentiment_score']
+                )
+                for analysis_job, _, job_result in completed
+            ])
+        except Exception as e:
+            logger.error("Error saving analysis results: %s", e)
+            for _, result, _ in completed:
+                result["status"] = "error"
+                result["error"] = str(e)
+            completed = []
+
+        # Phase 5: notify subscribers of all tickers concurrently
+        notifications_sent = 0
+        if self.bot and completed:
+            sent_counts = await asyncio.gather(*(
+                self._send_notifications(
+                    analysis_job.ticker,
+                    analysis_job.company_name,
+                    job_result,
+                    subscribers.get(analysis_job.ticker, [])
+                )
+                for analysis_job, _, job_result in completed
+            ))
+            notifications_sent = sum(sent_counts)
 
         return {
             "tickers_processed": len(tracked_tickers),
@@ -160,19 +263,62 @@ class StockTrackerJob(Job):
             "results": results
         }
 
+    async def _build_ticker_result(
+        self,
+        analysis_job: StockAnalysisJob,
+        articles: Any,
+        sentiment_scores: np.ndarray
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Build a ticker's analysis from its slice of the sentiment batch.
+        articles is what collect_articles returned, or the exception it
+        raised. Returns the ticker's result entry and the analysis
+        result, which is None if the ticker failed.
+        """
+        ticker = analysis_job.ticker
+
+        if isinstance(articles, BaseException):
+            logger.error("✗ %s: %s", ticker, articles)
+            return {
+                "ticker": ticker,
+                "status": "failed",
+                "error": str(articles)
+            }, None
+
+        try:
+            job_result = await analysis_job.build_result(sentiment_scores)
+
+            logger.info(
+                "✓ %s: %s (%d articles)",
+                ticker,
+                job_result['sentiment_label'],
+                job_result['articles_found']
+            )
+
+            return {
+                "ticker": ticker,
+                "status": "success",
+                "sentiment": job_result['sentiment_label'],
+                "articles": job_result['articles_found']
+            }, job_result
+
+        except Exception as e:
+            logger.error("Error analyzing %s: %s", ticker, e)
+            return {
+                "ticker": ticker,
+                "status": "error",
+                "error": str(e)
+            }, None
+
     async def _send_notifications(
         self,
         ticker: str,
         company_name: str,
-        analysis_result: Dict[str, Any]
+        analysis_result: Dict[str, Any],
+        discord_ids: List[str]
     ) -> int:
         """Send notifications to all subscribers of a ticker"""
         try:
-            # Get all subscribers
-            discord_ids = self.subscriptions_table.get_subscribers_for_ticker(
-                ticker
-            )
-
             if not discord_ids:
                 return 0
 
@@ -226,21 +372,37 @@ class StockTrackerJob(Job):
 
             embed.set_footer(text=f"Analysis completed at {datetime.now().strftime('%Y-%m-%d %H:%M UTC')}")
 
-            # Send to all subscribers
-            sent_count = 0
-            for discord_id in discord_ids:
-                try:
-                    user = await self.bot.fetch_user(int(discord_id))
-                    await user.send(embed=embed)
-                    sent_count += 1
-                    logger.info(f"Sent notification to user {discord_id}")
-                except Exception as e:
-                    logger.error(
-                        f"Failed to send notification to {discord_id}: {e}"
-                    )
-
-            return sent_count
+            # Send to all subscribers concurrently, a few DMs at a time
+            semaphore = asyncio.Semaphore(NOTIFICATION_CONCURRENCY)
+
+            async def send(discord_id: str) -> bool:
+                async with semaphore:
+                    try:
+                        # Cached users need no API call
+                        user = (
+                            self.bot.get_user(int(discord_id)) or
+                            await self.bot.fetch_user(int(discord_id))
+                        )
+                        await user.send(embed=embed)
+                        logger.info(
+                            "Sent notification to user %s",
+                            discord_id
+                        )
+                        return True
+                    except Exception as e:
+                        logger.error(
+                            "Failed to send notification to %s: %s",
+                            discord_id,
+                            e
+                        )
+                        return False
+
+            sent = await asyncio.gather(
+                *(send(discord_id) for discord_id in discord_ids)
+            )
+
+            return sum(sent)
 
         except Exception as e:
-            logger.error(f"Error sending notifications for {ticker}: {e}")
+            logger.error("Error sending notifications for %s: %s", ticker, e)
             return 0
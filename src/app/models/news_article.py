@@ -1,9 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+# Fields that make up get_full_text()
+_TEXT_FIELDS = frozenset(("title", "description", "content"))
 
-@dataclass
+
+@dataclass(slots=True)
 class NewsArticle:
     """
     Represents a news article scraped from a news source.
@@ -15,21 +18,32 @@ class NewsArticle:
     source: str
     published_at: datetime
     author: Optional[str] = None
+    _full_text: Optional[str] = field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False
+    )
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        # Content is filled in after scraping, so drop any cached text
+        if name in _TEXT_FIELDS:
+            object.__setattr__(self, "_full_text", None)
 
     def get_full_text(self) -> str:
         """
         Get the full text content of the article.
         Combines title, description, and content.
         """
-        parts = [self.title]
-
-        if self.description:
-            parts.append(self.description)
-
-        if self.content:
-            parts.append(self.content)
+        if self._full_text is None:
+            self._full_text = " ".join(
+                part
+                for part in (self.title, self.description, self.content)
+                if part
+            )
 
-        return " ".join(parts)
+        return self._full_text
 
     def __str__(self) -> str:
         return f"{self.title} - {self.source} ({self.published_at})"
@@ -1,9 +1,14 @@
 """Pydantic models for stock data"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import datetime
 
 
+def normalize_ticker(ticker: str) -> str:
+    """Tickers are stored and compared in upper case"""
+    return ticker.strip().upper()
+
+
 class Stock(BaseModel):
     """Stock model for database storage"""
     ticker: str = Field(..., description="Stock ticker symbol")
@@ -14,9 +19,16 @@ class Stock(BaseModel):
     )
     last_sentiment_score: Optional[float] = Field(
         None,
+        ge=-1,
+        le=1,
         description="Last sentiment score (-1 to 1)"
     )
 
+    @field_validator("ticker")
+    @classmethod
+    def _normalize_ticker(cls, v: str) -> str:
+        return normalize_ticker(v)
+
 
 class UserStockSubscription(BaseModel):
     """User stock subscription model"""
@@ -24,3 +36,8 @@ class UserStockSubscription(BaseModel):
     discord_id: str = Field(..., description="Discord user ID")
     ticker: str = Field(..., description="Stock ticker symbol")
     company_name: str = Field(..., description="Company name")
+
+    @field_validator("ticker")
+    @classmethod
+    def _normalize_ticker(cls, v: str) -> str:
+        return normalize_ticker(v)
@@ -1,36 +1,81 @@
 import aiohttp
+import asyncio
+import functools
+import re
 import trafilatura
-from typing import Optional, List
+from trafilatura.settings import use_config
+from typing import Dict, Optional, List
 from logging import getLogger
 from app.models import NewsArticle
+from app.services.content_cache import ContentCache, get_content_cache
 
 logger = getLogger(__name__)
 
+# Pages this small parse faster inline than the executor hand-off costs
+INLINE_EXTRACT_MAX_CHARS = 10_000
+
+# Article bodies sit well within the first 512 KB; the rest of very
+# large pages is mostly inline images, scripts and ads
+MAX_HTML_BYTES = 512 * 1024
+READ_CHUNK_BYTES = 16 * 1024
+
+# Pages without any article-shaped markup near the top (login walls,
+# error shells, paywall stubs) never yield content, so skip parsing them
+ARTICLE_MARKUP_RE = re.compile(
+    rb'<article[\s>]'
+    rb'|og:type"\s+content="article'
+    rb'|content="article"\s+(?:property|name)="og:type'
+    rb'|"@type"\s*:\s*"(?:News)?Article"',
+    re.IGNORECASE
+)
+ARTICLE_MARKUP_SCAN_BYTES = 64 * 1024
+
+# Built once rather than per page
+_extract_content = functools.partial(
+    trafilatura.extract,
+    include_comments=False,
+    include_tables=False,
+    no_fallback=False,
+    config=use_config()
+)
+
 
 class ArticleContentFetcher:
     """
     Service for fetching full article content from URLs.
     """
 
-    def __init__(self, max_concurrent: int = 5):
+    def __init__(
+        self,
+        max_concurrent: int = 5,
+        session: Optional[aiohttp.ClientSession] = None,
+        cache: Optional[ContentCache] = None
+    ):
         """
         Initialize the content fetcher.
 
         Args:
             max_concurrent: Maximum concurrent requests
+            session: Shared HTTP session; if omitted the instance
+                creates and closes its own
+            cache: Extracted-content cache; defaults to the shared
+                on-disk cache
         """
         self.max_concurrent = max_concurrent
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.cache = cache if cache is not None else get_content_cache()
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
 
     async def __aenter__(self):
         """Context manager entry."""
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+            self._owns_session = True
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        if self.session:
-            await self.session.close()
+        await self.close()
 
     async def fetch_article_content(
         self,
@@ -46,12 +91,54 @@ class ArticleContentFetcher:
             Updated NewsArticle with full content
         """
         if not article.url or not article.url.startswith('http'):
-            logger.debug(f"Skipping invalid URL: {article.url}")
+            logger.debug("Skipping invalid URL: %s", article.url)
             return article
 
+        cached = await self._get_cached([article.url])
+        if article.url in cached:
+            if cached[article.url]:
+                article.content = cached[article.url]
+            return article
+
+        content = await self._download_content(article)
+        if content is not None:
+            await self._set_cached({article.url: content})
+        return article
+
+    async def _get_cached(self, urls: List[str]) -> Dict[str, str]:
+        """Cached content for urls; an unusable cache is just a miss"""
+        try:
+            return await self.cache.get_many_async(urls)
+        except Exception as e:
+            logger.warning("Content cache lookup failed: %s", e)
+            return {}
+
+    async def _set_cached(self, contents: Dict[str, str]) -> None:
+        """Store extracted content, logging rather than raising on error"""
+        try:
+            await self.cache.set_many_async(contents)
+        except Exception as e:
+            logger.warning("Content cache write failed: %s", e)
+
+    async def _download_content(
+        self,
+        article: NewsArticle
+    ) -> Optional[str]:
+        """
+        Download and extract an article's content, setting it on the
+        article when usable.
+
+        Args:
+            article: NewsArticle object with a valid URL
+
+        Returns:
+            Content to cache for the URL ("" for a page without usable
+            content), or None if the fetch failed and shouldn't be cached
+        """
         try:
             if not self.session:
                 self.session = aiohttp.ClientSession()
+                self._owns_session = True
 
             headers = {
                 "User-Agent": (
@@ -68,39 +155,74 @@ class ArticleContentFetcher:
             ) as response:
                 if response.status != 200:
                     logger.debug(
-                        f"Failed to fetch {article.url}: "
-                        f"status {response.status}"
+                        "Failed to fetch %s: status %s",
+                        article.url,
+                        response.status
                     )
-                    return article
+                    return None
 
-                html = await response.text()
+                body = await self._read_body(response)
 
-                # Extract main content using trafilatura
-                content = trafilatura.extract(
-                    html,
-                    include_comments=False,
-                    include_tables=False,
-                    no_fallback=False
+                if not ARTICLE_MARKUP_RE.search(
+                    body[:ARTICLE_MARKUP_SCAN_BYTES]
+                ):
+                    logger.debug("No article markup in %s", article.url)
+                    return ""
+
+                html = body.decode(
+                    response.charset or "utf-8",
+                    errors="replace"
                 )
 
+                # Extract main content using trafilatura
+                extract = functools.partial(_extract_content, html)
+                if len(html) <= INLINE_EXTRACT_MAX_CHARS:
+                    content = extract()
+                else:
+                    # Parsing is CPU-bound; keep it off the event loop so
+                    # other fetches and the bot stay responsive
+                    loop = asyncio.get_running_loop()
+                    content = await loop.run_in_executor(None, extract)
+
                 if content and len(content) > 100:
                     article.content = content
                     logger.debug(
-                        f"Extracted {len(content)} chars from {article.url}"
-                    )
-                else:
-                    logger.debug(
-                        f"No content extracted from {article.url}"
+                        "Extracted %d chars from %s",
+                        len(content),
+                        article.url
                     )
+                    return content
 
-                return article
+                # Remember pages without usable content as well
+                logger.debug("No content extracted from %s", article.url)
+                return ""
 
         except aiohttp.ClientError as e:
-            logger.debug(f"Network error fetching {article.url}: {e}")
-            return article
+            logger.debug("Network error fetching %s: %s", article.url, e)
+            return None
         except Exception as e:
-            logger.debug(f"Error fetching {article.url}: {e}")
-            return article
+            logger.debug("Error fetching %s: %s", article.url, e)
+            return None
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytes:
+        """
+        Read a response body up to MAX_HTML_BYTES.
+
+        Args:
+            response: Response whose body hasn't been read yet
+
+        Returns:
+            Raw (possibly truncated) body
+        """
+        chunks = []
+        total = 0
+        async for chunk in response.content.iter_chunked(READ_CHUNK_BYTES):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= MAX_HTML_BYTES:
+                break
+
+        return b"".join(chunks)
 
     async def fetch_multiple_contents(
         self,
@@ -115,36 +237,59 @@ class ArticleContentFetcher:
         Returns:
             List of updated NewsArticle objects with content
         """
-        import asyncio
+        logger.info("Fetching content for %d articles", len(articles))
+
+        valid = []
+        for article in articles:
+            if article.url and article.url.startswith('http'):
+                valid.append(article)
+            else:
+                logger.debug("Skipping invalid URL: %s", article.url)
+
+        # One cache lookup and one write for the whole batch
+        cached = await self._get_cached([article.url for article in valid])
+        pending = []
+        for article in valid:
+            if article.url not in cached:
+                pending.append(article)
+            elif cached[article.url]:
+                article.content = cached[article.url]
 
-        logger.info(f"Fetching content for {len(articles)} articles")
+        # Keep max_concurrent requests in flight; a slow URL only holds
+        # up its own slot rather than a whole batch
+        semaphore = asyncio.Semaphore(self.max_concurrent)
 
-        # Process in batches to avoid overwhelming servers
-        updated_articles = []
-        for i in range(0, len(articles), self.max_concurrent):
-            batch = articles[i:i + self.max_concurrent]
-            tasks = [
-                self.fetch_article_content(article)
-                for article in batch
-            ]
-            batch_results = await asyncio.gather(*tasks)
-            updated_articles.extend(batch_results)
+        async def fetch_guarded(article: NewsArticle) -> Optional[str]:
+            async with semaphore:
+                return await self._download_content(article)
+
+        contents = await asyncio.gather(
+            *(fetch_guarded(article) for article in pending)
+        )
+        await self._set_cached({
+            article.url: content
+            for article, content in zip(pending, contents)
+            if content is not None
+        })
 
         # Count successful fetches
         success_count = sum(
-            1 for article in updated_articles
+            1 for article in articles
             if article.content and len(article.content) > 100
         )
 
         logger.info(
-            f"Successfully fetched content for {success_count}/"
-            f"{len(articles)} articles"
+            "Successfully fetched content for %d/%d articles",
+            success_count,
+            len(articles)
         )
 
-        return updated_articles
+        # Articles are updated in place
+        return articles
 
     async def close(self):
         """Close the HTTP session."""
-        if self.session:
+        # A shared session belongs to whoever passed it in
+        if self.session and self._owns_session:
             await self.session.close()
-            self.session = None
+        self.session = None
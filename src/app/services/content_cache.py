@@ -0,0 +1,149 @@
+"""On-disk cache of extracted article content, keyed by URL hash"""
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+ARTICLE_CACHE_PATH = os.getenv("ARTICLE_CACHE_PATH", "article_cache.sqlite3")
+ARTICLE_CACHE_TTL = int(os.getenv("ARTICLE_CACHE_TTL", "86400"))
+
+
+class ContentCache:
+    """
+    Persistent URL -> extracted content cache backed by SQLite, so
+    articles seen in an earlier run aren't downloaded and parsed again.
+    An empty string records a page that had no extractable content.
+    Database errors are logged and treated as misses.
+
+    The async methods run queries on the cache's own thread, so disk I/O
+    never blocks the event loop and the connection is only ever used
+    from one thread at a time.
+    """
+
+    def __init__(
+        self,
+        path: str = ARTICLE_CACHE_PATH,
+        ttl: int = ARTICLE_CACHE_TTL
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds an entry stays valid
+        """
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="content-cache"
+        )
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS article_content ("
+            "key BLOB PRIMARY KEY, fetched_at REAL, content TEXT)"
+        )
+
+    @staticmethod
+    def _key(url: str) -> bytes:
+        return hashlib.blake2b(url.encode(), digest_size=16).digest()
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up several URLs with one query.
+
+        Args:
+            urls: URLs to look up
+
+        Returns:
+            Cached content for each URL that has a live entry
+        """
+        keys = {self._key(url): url for url in urls}
+        if not keys:
+            return {}
+
+        placeholders = ", ".join("?" * len(keys))
+        try:
+            rows = self.db.execute(
+                "SELECT key, fetched_at, content FROM article_content "
+                f"WHERE key IN ({placeholders})",
+                list(keys)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Error reading content cache: {e}")
+            return {}
+
+        now = time.time()
+        return {
+            keys[key]: content
+            for key, fetched_at, content in rows
+            if now - fetched_at < self.ttl
+        }
+
+    def set_many(self, contents: Dict[str, str]) -> None:
+        """
+        Store extracted content for several URLs in one transaction.
+
+        Args:
+            contents: URL -> extracted content ("" for none)
+        """
+        if not contents:
+            return
+
+        now = time.time()
+        try:
+            with self.db:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO article_content "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (self._key(url), now, content)
+                        for url, content in contents.items()
+                    ]
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Error writing content cache: {e}")
+
+    async def get_many_async(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Run get_many on the cache thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self.get_many,
+            list(urls)
+        )
+
+    async def set_many_async(self, contents: Dict[str, str]) -> None:
+        """Run set_many on the cache thread."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.set_many, contents)
+
+    def close(self) -> None:
+        """Wait for pending writes, then close the database."""
+        self._executor.shutdown(wait=True)
+        self.db.close()
+
+
+_shared_cache: Optional[ContentCache] = None
+
+
+def get_content_cache() -> ContentCache:
+    """The process-wide cache, opened on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ContentCache()
+    return _shared_cache
+
+
+def close_content_cache() -> None:
+    """Close the process-wide cache, if it was opened."""
+    global _shared_cache
+    if _shared_cache is not None:
+        _shared_cache.close()
+        _shared_cache = None
@@ -1,37 +1,70 @@
 import aiohttp
+import asyncio
+import functools
+import orjson
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
 from logging import getLogger
 from app.models import NewsArticle
+from app.utils import TTLCache
+from app.services.http_session import create_session
 
 logger = getLogger(__name__)
 
+# Several users asking about the same stock within a couple of minutes
+# get the same results; concurrent identical queries share one request
+_news_cache = TTLCache(maxsize=256, ttl=120)
+_news_fetches: Dict[tuple, asyncio.Task] = {}
+
+
+def _store_news(key: tuple, fetch: asyncio.Task) -> None:
+    """Done callback that caches a finished fetch's articles"""
+    _news_fetches.pop(key, None)
+    if fetch.cancelled() or fetch.exception() is not None:
+        return
+    # Errors also come back empty, so only cache real results
+    articles = fetch.result()
+    if articles:
+        _news_cache.set(key, articles)
+
 
 class FinnhubScraper:
     """
     Service for fetching news articles from Finnhub API.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        concurrency: int = 8
+    ):
         """
         Initialize the Finnhub scraper.
 
         Args:
             api_key: Finnhub API key
+            session: Shared HTTP session; if omitted the instance
+                creates and closes its own
+            concurrency: Maximum requests in flight at once, so tickers
+                fanned out over a shared scraper can't stampede the API
         """
         self.api_key = api_key
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self._sem = asyncio.Semaphore(concurrency)
         self.base_url = "https://finnhub.io/api/v1"
 
     async def __aenter__(self):
         """Context manager entry."""
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = create_session()
+            self._owns_session = True
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        if self.session:
-            await self.session.close()
+        await self.close()
 
     async def search_news(
         self,
@@ -50,8 +83,34 @@ class FinnhubScraper:
         Returns:
             List of NewsArticle objects
         """
+        key = (ticker.upper(), hours_back, max_articles)
+        cached = _news_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        fetch = _news_fetches.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(
+                self._fetch_news(ticker, hours_back, max_articles)
+            )
+            _news_fetches[key] = fetch
+            # Cached from the task itself; a fetch whose callers all went
+            # away still pays off for the next one
+            fetch.add_done_callback(functools.partial(_store_news, key))
+
+        # A cancelled caller leaves the fetch running for the rest
+        return list(await asyncio.shield(fetch))
+
+    async def _fetch_news(
+        self,
+        ticker: str,
+        hours_back: int = 12,
+        max_articles: int = 15
+    ) -> List[NewsArticle]:
+        """Query Finnhub for a ticker's news"""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = create_session()
+            self._owns_session = True
 
         # Calculate date range
         to_date = datetime.now(timezone.utc)
@@ -66,8 +125,7 @@ class FinnhubScraper:
         params = {
             'symbol': ticker.upper(),
             'from': from_str,
-            'to': to_str,
-            'token': self.api_key
+            'to': to_str
         }
 
         try:
@@ -76,14 +134,21 @@ class FinnhubScraper:
                 f"from {from_str} to {to_str}"
             )
 
-            async with self.session.get(url, params=params) as response:
+            async with (
+                self._sem,
+                self.session.get(
+                    url,
+                    params=params,
+                    headers={'X-Finnhub-Token': self.api_key}
+                ) as response
+            ):
                 if response.status != 200:
                     logger.error(
                         f"Finnhub returned status {response.status}"
                     )
                     return []
 
-                data = await response.json()
+                data = orjson.loads(await response.read())
 
                 if not isinstance(data, list):
                     logger.error("Unexpected Finnhub response format")
@@ -133,27 +198,37 @@ class FinnhubScraper:
             List of NewsArticle objects
         """
         articles = []
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+        cutoff_ts = (
+            datetime.now(timezone.utc) - timedelta(hours=hours_back)
+        ).timestamp()
 
         for item in data:
-            try:
-                article = self._parse_single_article(item, ticker)
-                if article and article.published_at >= cutoff_time:
-                    articles.append(article)
-
-                    if len(articles) >= max_articles:
-                        break
+            # Malformed items are skipped rather than losing the response
+            if not isinstance(item, dict):
+                continue
+            timestamp = item.get('datetime') or 0
+            if not isinstance(timestamp, (int, float)):
+                continue
 
-            except Exception as e:
-                logger.debug(f"Error parsing article: {e}")
+            # Most of a response is usually older than the window, so
+            # check the raw timestamp before building anything
+            if timestamp and timestamp < cutoff_ts:
                 continue
 
+            article = self._parse_single_article(item, ticker, timestamp)
+            if article:
+                articles.append(article)
+
+                if len(articles) >= max_articles:
+                    break
+
         return articles
 
     def _parse_single_article(
         self,
         item: dict,
-        ticker: str
+        ticker: str,
+        timestamp: int = 0
     ) -> Optional[NewsArticle]:
         """
         Parse a single article from Finnhub API.
@@ -161,6 +236,7 @@ class FinnhubScraper:
         Args:
             item: Article dictionary from API
             ticker: Stock ticker symbol
+            timestamp: The item's Unix publish time, 0 if unknown
 
         Returns:
             NewsArticle object or None
@@ -179,16 +255,15 @@ class FinnhubScraper:
             #   "url": "https://..."
             # }
 
-            title = item.get('headline', '').strip()
+            title = (item.get('headline') or '').strip()
             if not title or len(title) < 10:
                 return None
 
-            url = item.get('url', '')
+            url = item.get('url') or ''
             if not url:
                 return None
 
             # Parse Unix timestamp to datetime
-            timestamp = item.get('datetime', 0)
             if timestamp:
                 published_at = datetime.fromtimestamp(
                     timestamp,
@@ -197,8 +272,8 @@ class FinnhubScraper:
             else:
                 published_at = datetime.now(timezone.utc)
 
-            description = item.get('summary', '').strip()
-            source = item.get('source', 'Finnhub').strip()
+            description = (item.get('summary') or '').strip()
+            source = (item.get('source') or 'Finnhub').strip()
 
             return NewsArticle(
                 title=title,
@@ -209,12 +284,13 @@ class FinnhubScraper:
                 published_at=published_at
             )
 
-        except Exception as e:
+        except (AttributeError, TypeError, ValueError, OverflowError) as e:
             logger.debug(f"Error parsing single article: {e}")
             return None
 
     async def close(self):
         """Close the HTTP session."""
-        if self.session:
+        # A shared session belongs to whoever passed it in
+        if self.session and self._owns_session:
             await self.session.close()
-            self.session = None
+        self.session = None
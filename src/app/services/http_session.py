@@ -0,0 +1,126 @@
+"""Shared aiohttp session for the scrapers and content fetcher"""
+import os
+import aiohttp
+from typing import Optional
+from aiohttp_client_cache import CachedResponse, CachedSession, SQLiteBackend
+
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "http_cache.sqlite")
+
+# News API responses overlap heavily between runs, so identical requests
+# are answered from disk for 10 minutes. Company profiles and symbol
+# searches barely change, so they're kept for a day and survive restarts
+# without spending Finnhub's per-minute quota. The first matching pattern
+# wins, so specific routes go before the wildcards. Article pages aren't
+# cached here; ArticleContentFetcher keeps their extracted text instead.
+API_CACHE_EXPIRY = {
+    "finnhub.io/api/v1/stock/profile2*": 86400,
+    "finnhub.io/api/v1/search*": 86400,
+    "newsapi.org/v2/*": 600,
+    "finnhub.io/api/v1/*": 600,
+    "finance.yahoo.com/quote/*": 600,
+}
+
+# Request headers carrying API keys; they're left out of cached responses
+# so the keys never reach the on-disk cache
+SECRET_HEADERS = frozenset({b"x-api-key", b"x-finnhub-token"})
+
+# Requests to the news APIs give up rather than stall a whole run
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
+
+def _create_connector() -> aiohttp.TCPConnector:
+    """Connector that keeps connections alive and caches DNS lookups"""
+    return aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=10,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True
+    )
+
+
+def _redact(response: CachedResponse) -> None:
+    """Strip API key headers from a cached response and its redirects"""
+    response.request_raw_headers = tuple(
+        (name, value)
+        for name, value in response.request_raw_headers
+        if name.lower() not in SECRET_HEADERS
+    )
+    for redirect in response.history:
+        _redact(redirect)
+
+
+class _RedactingSQLiteBackend(SQLiteBackend):
+    """SQLite cache backend that doesn't store API key headers"""
+
+    async def save_response(self, response, cache_key=None, expires=None):
+        cache_key = cache_key or self.create_key(response.method, response.url)
+        cached_response = await CachedResponse.from_client_response(
+            response,
+            expires
+        )
+        _redact(cached_response)
+        await self.responses.write(cache_key, cached_response)
+
+        # Alias redirected requests to the same cache entry, as the base
+        # backend does
+        for redirect in response.history:
+            await self.redirects.write(
+                self.create_key(redirect.method, redirect.url),
+                cache_key
+            )
+
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Create an uncached session for a service used on its own, with the
+    same connection reuse and timeouts as the shared session.
+    """
+    return aiohttp.ClientSession(
+        connector=_create_connector(),
+        timeout=REQUEST_TIMEOUT
+    )
+
+
+def create_shared_session() -> aiohttp.ClientSession:
+    """
+    Create a session meant to be shared by every scraper, so
+    connections, DNS lookups and TLS sessions are reused across services.
+    GET responses from the news APIs are cached on disk, without the
+    API key headers the scrapers send. The application creates one at
+    startup and passes it in; the scrapers never close a session they
+    were given.
+    """
+    return CachedSession(
+        cache=_RedactingSQLiteBackend(
+            HTTP_CACHE_PATH,
+            expire_after=0,  # don't cache anything not listed below
+            urls_expire_after=API_CACHE_EXPIRY,
+            allowed_methods=("GET",)
+        ),
+        connector=_create_connector(),
+        timeout=REQUEST_TIMEOUT
+    )
+
+
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Get the process-wide shared session, creating it on first use. The
+    bot commands and every scheduled run use it, so connections to the
+    news APIs and Finnhub stay open for the life of the process.
+    """
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = create_shared_session()
+    return _shared_session
+
+
+async def close_shared_session() -> None:
+    """Close the process-wide shared session, if one was created"""
+    global _shared_session
+    if _shared_session is not None:
+        await _shared_session.close()
+        _shared_session = None
@@ -0,0 +1,142 @@
+"""Helpers for preparing transformer models for inference"""
+import contextlib
+import functools
+import os
+import platform
+import threading
+import torch
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = getLogger(__name__)
+
+# Loaded (tokenizer, model) pairs, shared by every instance that asks for
+# the same model so weights are read from disk and held in memory once
+_shared_models: Dict[Hashable, Tuple[Any, Any]] = {}
+# One inference thread per shared model, under the same keys, so
+# instances sharing weights never run them from two threads at once
+_shared_executors: Dict[Hashable, ThreadPoolExecutor] = {}
+_shared_models_lock = threading.Lock()
+
+
+def shared_model(
+    key: Hashable,
+    load: Callable[[], Tuple[Any, Any]]
+) -> Tuple[Any, Any]:
+    """
+    Get the (tokenizer, model) pair registered under key, calling load
+    to create it if this is the first request. Concurrent first requests
+    wait for a single load.
+
+    Args:
+        key: Identifies the model and how it was prepared
+        load: Loads and returns a (tokenizer, model) pair
+
+    Returns:
+        The shared (tokenizer, model) pair
+    """
+    with _shared_models_lock:
+        if key not in _shared_models:
+            _shared_models[key] = load()
+        return _shared_models[key]
+
+
+def shared_executor(key: Hashable, name: str) -> ThreadPoolExecutor:
+    """
+    Get the single-worker executor for the model registered under key,
+    creating it on first use. Async callers run inference on it, which
+    serializes every use of the shared model and keeps the number of
+    threads fixed however many instances are created.
+
+    Args:
+        key: The key the model is (or will be) registered under
+        name: Thread name prefix for a new executor
+
+    Returns:
+        The model's executor
+    """
+    with _shared_models_lock:
+        if key not in _shared_executors:
+            _shared_executors[key] = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix=name
+            )
+        return _shared_executors[key]
+
+
+def int8_enabled() -> bool:
+    """Whether CPU models should be INT8-quantized (USE_INT8=1)"""
+    return os.getenv("USE_INT8") == "1"
+
+
+def quantize_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Dynamically quantize a model's Linear layers to INT8 for CPU
+    inference. Weights are stored as int8 and activations quantized on
+    the fly, so no calibration data is needed.
+
+    Args:
+        model: Model in eval mode on the CPU
+
+    Returns:
+        Quantized copy of the model
+    """
+    arm = platform.machine().lower() in ("arm64", "aarch64")
+    engine = "qnnpack" if arm else "fbgemm"
+    if engine in torch.backends.quantized.supported_engines:
+        torch.backends.quantized.engine = engine
+
+    logger.info(f"Quantizing {type(model).__name__} to INT8 ({engine})")
+    return torch.ao.quantization.quantize_dynamic(
+        model,
+        {torch.nn.Linear},
+        dtype=torch.qint8
+    )
+
+
+def compile_enabled() -> bool:
+    """Whether model forwards should be compiled (TORCH_COMPILE=1)"""
+    return os.getenv("TORCH_COMPILE") == "1"
+
+
+def compile_forward(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Compile a model's forward pass so LayerNorm, GELU and attention run
+    as fused kernels. forward is replaced in place, so generate() on
+    seq2seq models uses the compiled graph as well. Shapes are marked
+    dynamic because batches are padded to their longest text.
+
+    Args:
+        model: Model in eval mode on its target device
+
+    Returns:
+        The same model with a compiled forward
+    """
+    logger.info(f"Compiling {type(model).__name__} with torch.compile")
+    model.forward = torch.compile(model.forward, dynamic=True)
+    return model
+
+
+@functools.lru_cache(maxsize=None)
+def _bf16_capable() -> bool:
+    """Ampere (sm_80) and newer GPUs have native BF16 tensor cores"""
+    return (
+        torch.cuda.is_available() and
+        torch.cuda.get_device_capability() >= (8, 0)
+    )
+
+
+def half_dtype() -> torch.dtype:
+    """Half-precision dtype for GPU weights: BF16 where supported"""
+    return torch.bfloat16 if _bf16_capable() else torch.float16
+
+
+def inference_autocast(device: str):
+    """
+    Autocast context for a forward pass: BF16 on GPUs that support it,
+    otherwise a no-op so CPU and older GPUs keep running in FP32.
+    """
+    if device == "cuda" and _bf16_capable():
+        return torch.autocast("cuda", dtype=torch.bfloat16)
+    return contextlib.nullcontext()
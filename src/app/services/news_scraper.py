@@ -1,11 +1,32 @@
 import aiohttp
+import asyncio
+import functools
+import orjson
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
 from logging import getLogger
 from app.models import NewsArticle
+from app.utils import TTLCache
+from app.services.http_session import create_session
 
 logger = getLogger(__name__)
 
+# NewsAPI's free tier is rate limited, so repeat queries for a stock are
+# answered from memory for two minutes and concurrent ones are coalesced
+_news_cache = TTLCache(maxsize=256, ttl=120)
+_news_fetches: Dict[tuple, asyncio.Task] = {}
+
+
+def _store_news(key: tuple, fetch: asyncio.Task) -> None:
+    """Done callback: cache a finished fetch's articles under key"""
+    _news_fetches.pop(key, None)
+    if fetch.cancelled() or fetch.exception() is not None:
+        return
+    # Errors also come back empty, so only cache real results
+    articles = fetch.result()
+    if articles:
+        _news_cache.set(key, articles)
+
 
 class NewsScraper:
     """
@@ -14,25 +35,37 @@ class NewsScraper:
 
     BASE_URL = "https://newsapi.org/v2/everything"
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        concurrency: int = 8
+    ):
         """
         Initialize the news scraper.
 
         Args:
             api_key: NewsAPI API key
+            session: Shared HTTP session; if omitted the instance
+                creates and closes its own
+            concurrency: Maximum requests in flight at once, so tickers
+                fanned out over a shared scraper can't stampede the API
         """
         self.api_key = api_key
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self._sem = asyncio.Semaphore(concurrency)
 
     async def __aenter__(self):
         """Context manager entry."""
-        self.session = aiohttp.ClientSession()
+        if self.session is None:
+            self.session = create_session()
+            self._owns_session = True
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        if self.session:
-            await self.session.close()
+        await self.close()
 
     async def search_news(
         self,
@@ -53,12 +86,48 @@ class NewsScraper:
         Returns:
             List of NewsArticle objects
         """
+        key = (ticker.upper(), company_name, hours_back, max_articles)
+        cached = _news_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        fetch = _news_fetches.get(key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(
+                self._fetch_news(
+                    ticker,
+                    company_name,
+                    hours_back,
+                    max_articles
+                )
+            )
+            _news_fetches[key] = fetch
+            # The fetch stores its own result, so it's cached even if
+            # every caller waiting on it is cancelled
+            fetch.add_done_callback(functools.partial(_store_news, key))
+
+        # Shielded so cancelling one caller doesn't cancel the fetch for
+        # the others waiting on it
+        return list(await asyncio.shield(fetch))
+
+    async def _fetch_news(
+        self,
+        ticker: str,
+        company_name: str = None,
+        hours_back: int = 12,
+        max_articles: int = 15
+    ) -> List[NewsArticle]:
+        """Query NewsAPI for a ticker's news"""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            self.session = create_session()
+            self._owns_session = True
 
-        # Calculate time range
-        to_time = datetime.now(timezone.utc)
-        from_time = to_time - timedelta(hours=hours_back)
+        # Calculate time range. The start is rounded down to the hour and
+        # the end left open so repeated requests within the hour are
+        # identical and can be served from the HTTP cache.
+        from_time = (
+            datetime.now(timezone.utc) - timedelta(hours=hours_back)
+        ).replace(minute=0, second=0, microsecond=0)
 
         # Build search query - use company name if provided
         search_query = company_name if company_name else ticker
@@ -67,11 +136,9 @@ class NewsScraper:
         params = {
             "q": search_query,
             "from": from_time.isoformat(),
-            "to": to_time.isoformat(),
             "sortBy": "publishedAt",
             "language": "en",
-            "pageSize": max_articles,
-            "apiKey": self.api_key
+            "pageSize": max_articles
         }
 
         try:
@@ -80,10 +147,14 @@ class NewsScraper:
                 f"from last {hours_back} hours"
             )
 
-            async with self.session.get(
-                self.BASE_URL,
-                params=params
-            ) as response:
+            async with (
+                self._sem,
+                self.session.get(
+                    self.BASE_URL,
+                    params=params,
+                    headers={"X-Api-Key": self.api_key}
+                ) as response
+            ):
                 if response.status != 200:
                     error_text = await response.text()
                     logger.error(
@@ -92,7 +163,7 @@ class NewsScraper:
                     )
                     return []
 
-                data = await response.json()
+                data = orjson.loads(await response.read())
 
                 if data.get("status") != "ok":
                     logger.error(f"NewsAPI returned error: {data}")
@@ -127,22 +198,20 @@ class NewsScraper:
 
         for article_data in raw_articles:
             try:
-                # Parse published date
+                # Parse published date (fromisoformat accepts "Z")
                 published_str = article_data.get("publishedAt")
                 if published_str:
-                    published_at = datetime.fromisoformat(
-                        published_str.replace("Z", "+00:00")
-                    )
+                    published_at = datetime.fromisoformat(published_str)
                 else:
                     published_at = datetime.now(timezone.utc)
 
                 # Create NewsArticle object
                 article = NewsArticle(
-                    title=article_data.get("title", ""),
+                    title=article_data.get("title") or "",
                     description=article_data.get("description"),
                     content=article_data.get("content"),
-                    url=article_data.get("url", ""),
-                    source=article_data.get("source", {}).get(
+                    url=article_data.get("url") or "",
+                    source=(article_data.get("source") or {}).get(
                         "name",
                         "Unknown"
                     ),
@@ -152,7 +221,7 @@ class NewsScraper:
 
                 articles.append(article)
 
-            except Exception as e:
+            except (AttributeError, TypeError, ValueError) as e:
                 logger.warning(f"Error parsing article: {e}")
                 continue
 
@@ -160,6 +229,7 @@ class NewsScraper:
 
     async def close(self):
         """Close the HTTP session."""
-        if self.session:
+        # A shared session belongs to whoever passed it in
+        if self.session and self._owns_session:
             await self.session.close()
-            self.session = None
+        self.session = None
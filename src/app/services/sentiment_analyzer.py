@@ -1,11 +1,64 @@
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from collections import Counter
+import asyncio
+import functools
+import numpy as np
+import os
 import torch
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from logging import getLogger
 from app.models import NewsArticle
+from app.services.model_utils import (
+    compile_enabled,
+    compile_forward,
+    half_dtype,
+    inference_autocast,
+    int8_enabled,
+    quantize_int8,
+    shared_executor,
+    shared_model
+)
 
 logger = getLogger(__name__)
 
+# Let the Rust tokenizer encode a batch's texts on several threads
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+LABELS = ("positive", "negative", "neutral")
+
+# Texts with fewer letters than this (tickers, prices, punctuation) carry
+# no sentiment FinBERT can read, so they skip the model and stay neutral
+MIN_ALPHA_CHARS = 20
+
+
+def _is_analyzable(text: str) -> bool:
+    """Whether text has enough letters to be worth a forward pass"""
+    if not text:
+        return False
+
+    # Stop at the threshold rather than counting a whole article
+    letters = 0
+    for char in text:
+        if char.isalpha():
+            letters += 1
+            if letters >= MIN_ALPHA_CHARS:
+                return True
+    return False
+
+
+def _to_result(scores: np.ndarray) -> Tuple[str, float, Dict[str, float]]:
+    """
+    Turn one row of FinBERT probabilities into (label, score, all_scores).
+    tolist() yields Python floats, so no per-element conversion is needed.
+    """
+    positive, negative, neutral = scores.tolist()
+    max_idx = int(scores.argmax())
+    return LABELS[max_idx], (positive, negative, neutral)[max_idx], {
+        "positive": positive,
+        "negative": negative,
+        "neutral": neutral
+    }
+
 
 class SentimentAnalyzer:
     """
@@ -13,36 +66,74 @@ class SentimentAnalyzer:
     Uses FinBERT model fine-tuned for financial sentiment.
     """
 
-    def __init__(self, model_name: str = "ProsusAI/finbert"):
+    def __init__(
+        self,
+        model_name: str = "ProsusAI/finbert",
+        use_fp16: bool = True
+    ):
         """
         Initialize the sentiment analyzer.
 
         Args:
             model_name: HuggingFace model name
+            use_fp16: Store weights in half precision when on a GPU
         """
         self.model_name = model_name
+        self.use_fp16 = use_fp16
         self.tokenizer = None
         self.model = None
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._model_key = (model_name, self.device, use_fp16)
+        # Inference runs on the model's one dedicated thread so async
+        # callers don't block the event loop; torch already uses every
+        # core per call
+        self._executor = shared_executor(self._model_key, "finbert")
 
     def load_model(self):
-        """Load the sentiment analysis model."""
+        """
+        Load the sentiment analysis model, reusing the weights if another
+        instance has already loaded it.
+        """
         if self.model is not None:
             return
 
+        self.tokenizer, self.model = shared_model(
+            self._model_key,
+            self._load_model
+        )
+
+    def _load_model(self):
+        """Load the tokenizer and model from the hub."""
         logger.info(f"Loading sentiment model: {self.model_name}")
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.tokenizer = AutoTokenizer.from_pretrained(
+                self.model_name,
+                use_fast=True
+            )
+            if not self.tokenizer.is_fast:
+                logger.warning(
+                    f"No fast tokenizer for {self.model_name}; "
+                    "tokenization will be slow"
+                )
             self.model = AutoModelForSequenceClassification.from_pretrained(
                 self.model_name
             )
             self.model.to(self.device)
             self.model.eval()
+            if self.device == "cuda" and self.use_fp16:
+                # Halves the weight bandwidth of every forward pass
+                self.model.to(dtype=half_dtype())
+            elif self.device == "cpu" and int8_enabled():
+                self.model = quantize_int8(self.model)
+            if compile_enabled():
+                self.model = compile_forward(self.model)
             logger.info(f"Model loaded successfully on {self.device}")
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             raise
 
+        return self.tokenizer, self.model
+
     def analyze_text(self, text: str) -> Tuple[str, float, Dict[str, float]]:
         """
         Analyze sentiment of a single text.
@@ -56,7 +147,7 @@ class SentimentAnalyzer:
             - score: Confidence score (0-1)
             - all_scores: Dict with scores for all labels
         """
-        if not text or len(text.strip()) < 10:
+        if not _is_analyzable(text):
             return "neutral", 0.0, {
                 "positive": 0.0,
                 "negative": 0.0,
@@ -82,28 +173,16 @@ class SentimentAnalyzer:
             inputs = {k: v.to(self.device) for k, v in inputs.items()}
 
             # Get predictions
-            with torch.no_grad():
-                outputs = self.model(**inputs)
+            with torch.inference_mode():
+                with inference_autocast(self.device):
+                    outputs = self.model(**inputs)
                 predictions = torch.nn.functional.softmax(
-                    outputs.logits,
+                    outputs.logits.float(),
                     dim=-1
                 )
 
             # FinBERT outputs: [positive, negative, neutral]
-            scores = predictions[0].cpu().numpy()
-            labels = ["positive", "negative", "neutral"]
-
-            # Get the label with highest score
-            max_idx = scores.argmax()
-            label = labels[max_idx]
-            score = float(scores[max_idx])
-
-            all_scores = {
-                label: float(score)
-                for label, score in zip(labels, scores)
-            }
-
-            return label, score, all_scores
+            return _to_result(predictions[0].cpu().numpy())
 
         except Exception as e:
             logger.error(f"Error analyzing sentiment: {e}")
@@ -138,37 +217,201 @@ class SentimentAnalyzer:
             "text_length": len(text)
         }
 
+    def analyze_texts(
+        self,
+        texts: List[str]
+    ) -> List[Tuple[str, float, Dict[str, float]]]:
+        """
+        Analyze sentiment of several texts with one forward pass.
+        Inputs are padded only to the longest text in the batch.
+
+        Args:
+            texts: Texts to analyze
+
+        Returns:
+            List of (label, score, all_scores), as from analyze_text
+        """
+        neutral = ("neutral", 0.0, {
+            "positive": 0.0,
+            "negative": 0.0,
+            "neutral": 1.0
+        })
+        results = [neutral] * len(texts)
+
+        # Texts too short to analyze stay neutral, as in analyze_text
+        indices = [
+            i for i, text in enumerate(texts)
+            if _is_analyzable(text)
+        ]
+        if not indices:
+            return results
+
+        predictions = self._predict([texts[i] for i in indices])
+        if predictions is not None:
+            for i, scores in zip(indices, predictions):
+                results[i] = _to_result(scores)
+
+        return results
+
+    def _predict(self, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Run one forward pass over analyzable texts, padded only to the
+        longest of them.
+
+        Args:
+            texts: Texts that passed _is_analyzable
+
+        Returns:
+            Array of shape (N, 3) with each text's positive, negative and
+            neutral probability, or None if the batch failed
+        """
+        if self.model is None:
+            self.load_model()
+
+        try:
+            max_length = 512
+            inputs = self.tokenizer(
+                [text[:max_length * 4] for text in texts],
+                return_tensors="pt",
+                truncation=True,
+                max_length=max_length,
+                padding="longest"
+            )
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+            with torch.inference_mode():
+                with inference_autocast(self.device):
+                    outputs = self.model(**inputs)
+                predictions = torch.nn.functional.softmax(
+                    outputs.logits.float(),
+                    dim=-1
+                )
+
+            # FinBERT outputs: [positive, negative, neutral]
+            return predictions.cpu().numpy()
+
+        except Exception as e:
+            logger.error(f"Error analyzing sentiment batch: {e}")
+            return None
+
     def analyze_multiple(
         self,
-        articles: List[NewsArticle]
+        articles: List[NewsArticle],
+        batch_size: int = 16
     ) -> List[Dict[str, any]]:
         """
         Analyze sentiment for multiple articles.
 
+        Articles are grouped into batches of similar text length, so
+        little of each forward pass is spent on padding.
+
         Args:
             articles: List of NewsArticle objects
+            batch_size: Articles per forward pass
 
         Returns:
-            List of sentiment analysis results
+            List of sentiment analysis results, in the order of articles
         """
         logger.info(f"Analyzing sentiment for {len(articles)} articles")
 
-        results = []
-        for article in articles:
-            result = self.analyze_article(article)
-            results.append(result)
+        texts = [article.get_full_text() for article in articles]
+        results = [None] * len(texts)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            batch_results = self.analyze_texts([texts[i] for i in batch])
+
+            for i, (label, score, all_scores) in zip(batch, batch_results):
+                results[i] = {
+                    "label": label,
+                    "score": score,
+                    "all_scores": all_scores,
+                    "text_length": len(texts[i])
+                }
 
         # Log summary
-        positive = sum(1 for r in results if r["label"] == "positive")
-        negative = sum(1 for r in results if r["label"] == "negative")
-        neutral = sum(1 for r in results if r["label"] == "neutral")
+        counts = Counter(r["label"] for r in results)
+
+        logger.info(
+            f"Sentiment summary - Positive: {counts['positive']}, "
+            f"Negative: {counts['negative']}, Neutral: {counts['neutral']}"
+        )
+
+        return results
+
+    def score_articles(
+        self,
+        articles: List[NewsArticle],
+        batch_size: int = 16
+    ) -> np.ndarray:
+        """
+        Get label probabilities for multiple articles, batched as in
+        analyze_multiple but without building a result per article.
+        Articles too short to analyze, or in a failed batch, count as
+        fully neutral.
+
+        Args:
+            articles: List of NewsArticle objects
+            batch_size: Articles per forward pass
+
+        Returns:
+            Array of shape (N, 3) with the positive, negative and neutral
+            probability of each article, in the order of articles; slices
+            of it can be passed to aggregate_scores
+        """
+        logger.info(f"Analyzing sentiment for {len(articles)} articles")
 
+        texts = [article.get_full_text() for article in articles]
+        scores = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+        scores[:, LABELS.index("neutral")] = 1.0
+
+        order = [
+            i for i in sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            if _is_analyzable(texts[i])
+        ]
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            predictions = self._predict([texts[i] for i in batch])
+            if predictions is not None:
+                scores[batch] = predictions
+
+        # Log summary
+        counts = np.bincount(scores.argmax(axis=1), minlength=len(LABELS))
+        positive, negative, neutral = counts.tolist()
         logger.info(
             f"Sentiment summary - Positive: {positive}, "
             f"Negative: {negative}, Neutral: {neutral}"
         )
 
-        return results
+        return scores
+
+    async def score_articles_async(
+        self,
+        articles: List[NewsArticle],
+        batch_size: int = 16
+    ) -> np.ndarray:
+        """Run score_articles on the inference thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(self.score_articles, articles, batch_size)
+        )
+
+    async def analyze_multiple_async(
+        self,
+        articles: List[NewsArticle],
+        batch_size: int = 16
+    ) -> List[Dict[str, any]]:
+        """
+        Run analyze_multiple on the inference thread, leaving the event
+        loop free for scraping and Discord traffic meanwhile.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(self.analyze_multiple, articles, batch_size)
+        )
 
     def aggregate_sentiment(
         self,
@@ -186,25 +429,32 @@ class SentimentAnalyzer:
         if not results:
             return "neutral", 0.0
 
-        # Calculate weighted average
-        total_positive = sum(r["all_scores"]["positive"] for r in results)
-        total_negative = sum(r["all_scores"]["negative"] for r in results)
-        total_neutral = sum(r["all_scores"]["neutral"] for r in results)
-
-        count = len(results)
-        avg_positive = total_positive / count
-        avg_negative = total_negative / count
-        avg_neutral = total_neutral / count
-
-        # Determine overall sentiment
-        scores = {
-            "positive": avg_positive,
-            "negative": avg_negative,
-            "neutral": avg_neutral
-        }
+        scores = np.array([
+            [r["all_scores"][label] for label in LABELS]
+            for r in results
+        ])
+
+        return self.aggregate_scores(scores)
+
+    def aggregate_scores(self, scores: np.ndarray) -> Tuple[str, float]:
+        """
+        Aggregate per-article label probabilities.
+
+        Args:
+            scores: Array of shape (N, 3) with the positive, negative and
+                neutral probability of each article
+
+        Returns:
+            Tuple of (overall_label, overall_score)
+        """
+        if not len(scores):
+            return "neutral", 0.0
+
+        # Calculate average of each label's probability
+        avg_positive, avg_negative, _ = scores.mean(axis=0)
 
         # Calculate sentiment score: positive - negative (range: -1 to 1)
-        sentiment_score = avg_positive - avg_negative
+        sentiment_score = float(avg_positive - avg_negative)
 
         # Determine label based on adjusted thresholds
         # Financial sentiment is typically close to 0, so use tighter bounds
@@ -1,28 +1,74 @@
 """Ticker validation and company name lookup service"""
 import aiohttp
+import asyncio
 import logging
+import orjson
+import re
 from typing import Optional, Dict, List
+from rapidfuzz import fuzz, utils
+
+from app.utils import TTLCache
+from app.services.http_session import create_session
 
 logger = logging.getLogger(__name__)
 
+# Corporate suffixes that say nothing about which company is meant
+SUFFIX_RE = re.compile(
+    r'\b(?:inc|corp|ltd|llc|co|corporation|company|holdings)\b'
+)
+# US ticker symbols; anything else can't be a listing Finnhub knows
+TICKER_RE = re.compile(r'[A-Z]{1,5}')
+
+
+def _normalize_company(name: str) -> str:
+    """
+    Lowercase, drop punctuation and corporate suffixes, and collapse
+    whitespace, so "Apple Inc." and "apple" compare equal.
+    """
+    return " ".join(SUFFIX_RE.sub(" ", utils.default_process(name)).split())
+
 
 class TickerValidator:
     """Validates ticker symbols and company names using Finnhub API"""
 
-    def __init__(self, finnhub_key: str):
+    def __init__(
+        self,
+        finnhub_key: str,
+        session: Optional[aiohttp.ClientSession] = None
+    ):
         self.finnhub_key = finnhub_key
         self.base_url = "https://finnhub.io/api/v1"
-        self.session = None
+        # A session passed in belongs to the caller and is left open
+        self.session = session
+        self._owns_session = session is None
+        # Ticker -> company mapping is effectively static day-to-day
+        self._profile_cache = TTLCache(maxsize=4096, ttl=3600)
+        # Popular searches repeat; in-flight ones are shared by callers
+        self._search_cache = TTLCache(maxsize=512, ttl=600)
+        self._searches: Dict[str, asyncio.Task] = {}
+        self._profiles: Dict[str, asyncio.Task] = {}
+        # Symbols Finnhub recently had no profile for
+        self._unknown_tickers = TTLCache(maxsize=1024, ttl=600)
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """
+        Get an open session, creating one if there is none or the last
+        one was closed. Nothing awaits between the check and the
+        assignment, so concurrent callers can't each create a session.
+        """
+        if self.session is None or self.session.closed:
+            self.session = create_session()
+            self._owns_session = True
+        return self.session
 
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        self._ensure_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        await self.close()
 
     async def search_symbol(
         self,
@@ -37,31 +83,62 @@ class TickerValidator:
         Returns:
             List of matches with ticker, company name, and type
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        key = query.upper().strip()
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            return cached
+
+        search = self._searches.get(key)
+        if search is None:
+            search = asyncio.ensure_future(self._fetch_search_results(key))
+            self._searches[key] = search
+            try:
+                results = await asyncio.shield(search)
+            finally:
+                self._searches.pop(key, None)
+            # Errors also come back empty, so only cache real matches
+            if results:
+                self._search_cache.set(key, results)
+            return results
+
+        return await asyncio.shield(search)
+
+    async def _fetch_search_results(
+        self,
+        query: str
+    ) -> List[Dict[str, str]]:
+        """Query Finnhub's symbol search endpoint"""
+        self._ensure_session()
 
         try:
             url = f"{self.base_url}/search"
             params = {
-                "q": query.upper(),
-                "token": self.finnhub_key
+                "q": query
             }
 
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(
+                url,
+                params=params,
+                headers={"X-Finnhub-Token": self.finnhub_key}
+            ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     results = []
 
-                    # Parse results
-                    for item in data.get("result", [])[:5]:  # Top 5
-                        # Filter for US stocks only
+                    # Parse results, keeping the top 5 US stocks; filter
+                    # before counting so foreign listings ranked first
+                    # don't crowd them out
+                    for item in data.get("result", []):
                         symbol = item.get("symbol", "")
-                        if "." not in symbol and len(symbol) <= 5:
-                            results.append({
-                                "ticker": item.get("symbol", ""),
-                                "company_name": item.get("description", ""),
-                                "type": item.get("type", "")
-                            })
+                        if not symbol or "." in symbol or len(symbol) > 5:
+                            continue
+                        results.append({
+                            "ticker": symbol,
+                            "company_name": item.get("description", ""),
+                            "type": item.get("type", "")
+                        })
+                        if len(results) >= 5:
+                            break
 
                     return results
                 else:
@@ -87,30 +164,69 @@ class TickerValidator:
         Returns:
             Dict with ticker and company_name if valid, None otherwise
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        ticker = ticker.upper().strip()
+        # Reject garbage and known misses without a round trip
+        if not TICKER_RE.fullmatch(ticker):
+            return None
+        if self._unknown_tickers.get(ticker):
+            return None
+
+        cached = self._profile_cache.get(ticker)
+        if cached is not None:
+            return cached
+
+        # Concurrent lookups of one ticker share a single request
+        lookup = self._profiles.get(ticker)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._fetch_profile(ticker))
+            self._profiles[ticker] = lookup
+            try:
+                ticker_info = await asyncio.shield(lookup)
+            finally:
+                self._profiles.pop(ticker, None)
+            if ticker_info:
+                self._profile_cache.set(ticker, ticker_info)
+            elif ticker_info is not None:
+                self._unknown_tickers.set(ticker, True)
+            return ticker_info or None
+
+        return await asyncio.shield(lookup) or None
+
+    async def _fetch_profile(
+        self,
+        ticker: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Query Finnhub's company profile endpoint. Returns an empty dict
+        when Finnhub has no profile for the ticker and None on errors.
+        """
+        self._ensure_session()
 
         try:
             url = f"{self.base_url}/stock/profile2"
             params = {
-                "symbol": ticker.upper(),
-                "token": self.finnhub_key
+                "symbol": ticker
             }
 
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(
+                url,
+                params=params,
+                headers={"X-Finnhub-Token": self.finnhub_key}
+            ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
 
                     # Check if we got valid data
                     if data and data.get("name"):
-                        return {
-                            "ticker": ticker.upper(),
+                        ticker_info = {
+                            "ticker": ticker,
                             "company_name": data.get("name", ""),
                             "exchange": data.get("exchange", ""),
                             "industry": data.get("finnhubIndustry", "")
                         }
+                        return ticker_info
                     else:
-                        return None
+                        return {}
                 else:
                     logger.error(
                         f"Finnhub validation failed: {response.status}"
@@ -121,17 +237,20 @@ class TickerValidator:
             logger.error(f"Error validating ticker: {e}")
             return None
 
-    async def verify_match(
-        self,
+    @staticmethod
+    def match_company_name(
         ticker: str,
-        company_name: str
+        company_name: str,
+        actual_company: str
     ) -> Dict[str, any]:
         """
-        Verify if ticker and company name match.
+        Compare a user-supplied company name against the known company
+        name for a ticker, without any API calls.
 
         Args:
             ticker: Stock ticker symbol
-            company_name: Company name
+            company_name: Company name entered by the user
+            actual_company: Company name the ticker belongs to
 
         Returns:
             Dict with:
@@ -140,23 +259,9 @@ class TickerValidator:
             - actual_company: str (actual company name for ticker)
             - suggestion: str (suggested correction if mismatch)
         """
-        # Validate the ticker
-        ticker_info = await self.validate_ticker(ticker)
-
-        if not ticker_info:
-            return {
-                "match": False,
-                "confidence": "none",
-                "actual_company": None,
-                "suggestion": f"Ticker '{ticker}' not found"
-            }
-
-        actual_company = ticker_info["company_name"]
-
         # Normalize for comparison
-        ticker_normalized = ticker.upper().strip()
-        company_normalized = company_name.lower().strip()
-        actual_normalized = actual_company.lower().strip()
+        company_normalized = _normalize_company(company_name)
+        actual_normalized = _normalize_company(actual_company)
 
         # Check for exact match
         if company_normalized == actual_normalized:
@@ -168,7 +273,8 @@ class TickerValidator:
             }
 
         # Check for partial match (one contains the other)
-        if (company_normalized in actual_normalized or
+        if company_normalized and actual_normalized and (
+                company_normalized in actual_normalized or
                 actual_normalized in company_normalized):
             return {
                 "match": True,
@@ -177,29 +283,15 @@ class TickerValidator:
                 "suggestion": None
             }
 
-        # Check for common abbreviations
-        # e.g., "Apple" vs "Apple Inc."
-        company_words = set(company_normalized.split())
-        actual_words = set(actual_normalized.split())
-        common_suffixes = {
-            'inc', 'inc.', 'corp', 'corp.', 'ltd', 'ltd.',
-            'llc', 'co', 'co.', 'corporation', 'company'
-        }
-
-        # Remove common suffixes
-        company_core = company_words - common_suffixes
-        actual_core = actual_words - common_suffixes
-
-        # If core words match, consider it a match
-        if company_core and actual_core:
-            overlap = len(company_core & actual_core) / len(company_core)
-            if overlap >= 0.7:
-                return {
-                    "match": True,
-                    "confidence": "medium",
-                    "actual_company": actual_company,
-                    "suggestion": None
-                }
+        # Fuzzy match on the words, ignoring their order
+        score = fuzz.token_set_ratio(company_normalized, actual_normalized)
+        if score >= 75:
+            return {
+                "match": True,
+                "confidence": "high" if score >= 90 else "medium",
+                "actual_company": actual_company,
+                "suggestion": None
+            }
 
         # No match
         return {
@@ -211,7 +303,14 @@ class TickerValidator:
             )
         }
 
+    def clear_cache(self) -> None:
+        """Drop all cached profiles, search results and unknown tickers"""
+        self._profile_cache.clear()
+        self._search_cache.clear()
+        self._unknown_tickers.clear()
+
     async def close(self):
-        """Close the aiohttp session"""
-        if self.session:
+        """Close the aiohttp session if this validator created it"""
+        if self.session and self._owns_session:
             await self.session.close()
+        self.session = None
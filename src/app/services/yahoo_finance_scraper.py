@@ -1,31 +1,107 @@
 import aiohttp
-from bs4 import BeautifulSoup
+import asyncio
+import re
+import lxml.html
+from lxml import etree
 from datetime import datetime, timezone, timedelta
 from typing import List, Optional
 from logging import getLogger
 from app.models import NewsArticle
+from app.services.http_session import create_session
 
 logger = getLogger(__name__)
 
 
+def _class_test(name: str) -> str:
+    """XPath predicate matching elements with name among their classes"""
+    return (
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+    )
+
+
+# Compiled once; XPath over lxml's C tree is far cheaper than walking a
+# BeautifulSoup tree in Python
+STREAM_ITEMS = etree.XPath(f"//li[{_class_test('stream-item')}]")
+ARTICLE_ITEMS = etree.XPath("//article")
+# Last resort when Yahoo changes markup; capped at $limit matches so an
+# unfamiliar page can't make us collect every div on it
+HEADLINE_DIVS = etree.XPath("(//div[.//h3 and .//a])[position() <= $limit]")
+TITLE_PATHS = [
+    etree.XPath(".//h3"),
+    etree.XPath(".//h2"),
+    etree.XPath(".//h4"),
+    etree.XPath(f".//*[{_class_test('Fw(b)')}]"),
+]
+FIRST_LINK = etree.XPath(".//a")
+PARENT_LINK = etree.XPath("ancestor::a")
+FIRST_PARAGRAPH = etree.XPath(".//p")
+TIME_ELEM = etree.XPath(".//time")
+SOURCE_ELEM = etree.XPath(f".//*[{_class_test('C($c-fuji-grey-j)')}]")
+TEXT_NODES = etree.XPath(".//text()")
+
+# Relative publish times: "5 minutes ago", "an hour ago", "yesterday"
+RELATIVE_TIME_RE = re.compile(r'(?:(\d+)|\ban?|yester)\s*(minute|hour|day)')
+TIME_UNITS = {"minute": "minutes", "hour": "hours", "day": "days"}
+
+
+def _first(path: etree.XPath, elem):
+    """First node path selects from elem, or None"""
+    nodes = path(elem)
+    return nodes[0] if nodes else None
+
+
+def _text(elem) -> str:
+    """An element's text with each text node stripped, as in get_text"""
+    return "".join(text.strip() for text in TEXT_NODES(elem))
+
+
 class YahooFinanceScraper:
     """
     Service for scraping news articles from Yahoo Finance.
     """
 
-    def __init__(self):
-        """Initialize the Yahoo Finance scraper."""
-        self.session: Optional[aiohttp.ClientSession] = None
+    # Yahoo serves a stripped page to unknown clients
+    HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/91.0.4472.124 Safari/537.36"
+        )
+    }
+
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        concurrency: int = 8
+    ):
+        """
+        Initialize the Yahoo Finance scraper.
+
+        Args:
+            session: Shared HTTP session; if omitted the instance
+                creates and closes its own
+            concurrency: Maximum quote pages fetched at once; Yahoo
+                throttles bursts from one client harder than the APIs
+        """
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self._sem = asyncio.Semaphore(concurrency)
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return an open session, replacing a missing or closed one."""
+        if self.session is None or self.session.closed:
+            self.session = create_session()
+            self._owns_session = True
+        return self.session
 
     async def __aenter__(self):
         """Context manager entry."""
-        self.session = aiohttp.ClientSession()
+        self._ensure_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        if self.session:
-            await self.session.close()
+        await self.close()
 
     async def search_news(
         self,
@@ -44,8 +120,7 @@ class YahooFinanceScraper:
         Returns:
             List of NewsArticle objects
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        self._ensure_session()
 
         # Try the main quote page which includes news
         url = f"https://finance.yahoo.com/quote/{ticker}/"
@@ -55,19 +130,14 @@ class YahooFinanceScraper:
                 f"Scraping Yahoo Finance news for {ticker}"
             )
 
-            headers = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/91.0.4472.124 Safari/537.36"
-                )
-            }
-
-            async with self.session.get(
-                url,
-                headers=headers,
-                allow_redirects=True
-            ) as response:
+            async with (
+                self._sem,
+                self.session.get(
+                    url,
+                    headers=self.HEADERS,
+                    allow_redirects=True
+                ) as response
+            ):
                 if response.status != 200:
                     logger.error(
                         f"Yahoo Finance returned status {response.status} "
@@ -75,10 +145,16 @@ class YahooFinanceScraper:
                     )
                     return []
 
-                html = await response.text()
+                # lxml decodes the bytes itself, so skip building a str
+                # copy of the page
+                html = await response.read()
                 logger.debug(f"Received {len(html)} bytes of HTML")
-                articles = self._parse_articles(
+                # Parsing a quote page is CPU work; keep it off the loop
+                articles = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    self._parse_articles,
                     html,
+                    response.charset or "utf-8",
                     ticker,
                     hours_back,
                     max_articles
@@ -97,7 +173,8 @@ class YahooFinanceScraper:
 
     def _parse_articles(
         self,
-        html: str,
+        html: bytes,
+        encoding: str,
         ticker: str,
         hours_back: int,
         max_articles: int
@@ -106,7 +183,8 @@ class YahooFinanceScraper:
         Parse HTML to extract news articles.
 
         Args:
-            html: HTML content from Yahoo Finance
+            html: Raw HTML from Yahoo Finance
+            encoding: Charset of the response
             ticker: Stock ticker symbol
             hours_back: Filter articles within this time window
             max_articles: Maximum articles to return
@@ -114,33 +192,31 @@ class YahooFinanceScraper:
         Returns:
             List of NewsArticle objects
         """
-        soup = BeautifulSoup(html, 'lxml')
+        # Parsers can't be shared between executor threads
+        parser = lxml.html.HTMLParser(encoding=encoding)
+        tree = lxml.html.fromstring(html, parser=parser)
         articles = []
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+        # One clock read for the whole page; relative times use it too
+        now = datetime.now(timezone.utc)
+        cutoff_time = now - timedelta(hours=hours_back)
 
         # Yahoo Finance news items - try multiple selectors
-        news_items = []
-        
         # Try finding list items with news
-        news_items = soup.find_all('li', class_='stream-item')
-        
+        news_items = STREAM_ITEMS(tree)
+
         if not news_items:
             # Try finding all article tags
-            news_items = soup.find_all('article')
-        
+            news_items = ARTICLE_ITEMS(tree)
+
         if not news_items:
             # Fallback: find all divs with links containing h3
-            potential_items = soup.find_all('div')
-            news_items = [
-                item for item in potential_items
-                if item.find('h3') and item.find('a')
-            ]
+            news_items = HEADLINE_DIVS(tree, limit=max_articles * 3)
 
         logger.info(f"Found {len(news_items)} potential news items")
 
         for item in news_items[:max_articles * 3]:  # Get extra for filtering
             try:
-                article = self._parse_single_article(item, ticker)
+                article = self._parse_single_article(item, ticker, now)
                 if article and article.title:
                     # Filter by time
                     if article.published_at >= cutoff_time:
@@ -158,67 +234,65 @@ class YahooFinanceScraper:
     def _parse_single_article(
         self,
         item,
-        ticker: str
+        ticker: str,
+        now: datetime
     ) -> Optional[NewsArticle]:
         """
         Parse a single article element.
 
         Args:
-            item: BeautifulSoup element
+            item: lxml element
             ticker: Stock ticker symbol
+            now: Time the page was parsed, in UTC
 
         Returns:
             NewsArticle object or None
         """
         try:
-            # Find title - try multiple approaches
-            title_elem = item.find('h3')
-            if not title_elem:
-                # Try finding any heading
-                title_elem = (
-                    item.find('h2') or item.find('h4') or
-                    item.find(class_='Fw(b)')
-                )
-
-            if not title_elem:
+            # Find title - try h3, then any heading
+            title_elem = None
+            for path in TITLE_PATHS:
+                title_elem = _first(path, item)
+                if title_elem is not None:
+                    break
+
+            if title_elem is None:
                 return None
 
             # Extract title
-            title = title_elem.get_text(strip=True)
+            title = _text(title_elem)
             if not title or len(title) < 10:
                 return None
 
             # Extract URL - be more aggressive in finding links
-            link_elem = item.find('a')
-            if not link_elem:
+            link_elem = _first(FIRST_LINK, item)
+            if link_elem is None:
                 # Try finding link within title element
-                link_elem = title_elem.find_parent('a')
+                parents = PARENT_LINK(title_elem)
+                link_elem = parents[-1] if parents else None
 
-            url = ""
-            if link_elem and link_elem.get('href'):
-                url = link_elem['href']
-                # Handle relative URLs
-                if url.startswith('/'):
-                    url = f"https://finance.yahoo.com{url}"
-                elif not url.startswith('http'):
-                    url = f"https://finance.yahoo.com/{url}"
+            url = link_elem.get('href') if link_elem is not None else None
+            url = url or ""
+            # Handle relative URLs
+            if url and not url.startswith(('http://', 'https://')):
+                separator = "" if url.startswith('/') else "/"
+                url = f"https://finance.yahoo.com{separator}{url}"
 
             # Extract description
-            desc_elem = item.find('p')
-            description = desc_elem.get_text(strip=True) if desc_elem else None
+            desc_elem = _first(FIRST_PARAGRAPH, item)
+            description = _text(desc_elem) if desc_elem is not None else None
 
             # Extract time - Yahoo uses relative times
-            time_elem = (
-                item.find('time') or
-                item.find(class_='C($c-fuji-grey-j)')
-            )
-            published_at = self._parse_time(time_elem)
+            source_elem = _first(SOURCE_ELEM, item)
+            time_elem = _first(TIME_ELEM, item)
+            if time_elem is None:
+                time_elem = source_elem
+            published_at = self._parse_time(time_elem, now)
 
             # Extract source
-            source_elem = item.find(class_='C($c-fuji-grey-j)')
             source = "Yahoo Finance"
-            if source_elem:
-                source_text = source_elem.get_text(strip=True)
+            if source_elem is not None:
+                source_text = _text(source_elem)
                 # Extract source name before bullet or time
                 if '•' in source_text:
                     source = source_text.split('•')[0].strip()
@@ -236,42 +310,38 @@ class YahooFinanceScraper:
             logger.debug(f"Error parsing single article: {e}")
             return None
 
-    def _parse_time(self, time_elem) -> datetime:
+    def _parse_time(self, time_elem, now: datetime) -> datetime:
         """
         Parse time element to datetime.
 
         Args:
-            time_elem: BeautifulSoup time element
+            time_elem: lxml time element
+            now: Time relative times are counted back from
 
         Returns:
             datetime object
         """
-        if not time_elem:
-            return datetime.now(timezone.utc)
+        if time_elem is None:
+            return now
 
         try:
-            time_text = time_elem.get_text(strip=True).lower()
+            time_text = _text(time_elem).lower()
 
             # Parse relative times
-            now = datetime.now(timezone.utc)
-
-            if 'hour' in time_text:
-                hours = int(''.join(filter(str.isdigit, time_text)) or 1)
-                return now - timedelta(hours=hours)
-            elif 'minute' in time_text:
-                minutes = int(''.join(filter(str.isdigit, time_text)) or 1)
-                return now - timedelta(minutes=minutes)
-            elif 'day' in time_text:
-                days = int(''.join(filter(str.isdigit, time_text)) or 1)
-                return now - timedelta(days=days)
+            match = RELATIVE_TIME_RE.search(time_text)
+            if match:
+                count = int(match.group(1) or 1)
+                unit = TIME_UNITS[match.group(2)]
+                return now - timedelta(**{unit: count})
             else:
                 return now
 
         except Exception:
-            return datetime.now(timezone.utc)
+            return now
 
     async def close(self):
         """Close the HTTP session."""
-        if self.session:
+        # A shared session belongs to whoever passed it in
+        if self.session and self._owns_session:
             await self.session.close()
-            self.session = None
+        self.session = None
@@ -0,0 +1,7 @@
+"""Shared utilities"""
+from .ttl_cache import TTLCache
+
+
+__all__ = [
+    "TTLCache"
+]
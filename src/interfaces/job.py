@@ -39,6 +39,8 @@ class Job(ABC):
                     cleanup_task()
             except Exception as e:
                 logger.error(f"Error running cleanup task in {self}: {e}")
+        # setup_resources registers them again if the job is re-run
+        self._cleanup_tasks = []
 
     def register_cleanup(self, cleanup_func: callable) -> None:
         '''
@@ -6,8 +6,13 @@ from dotenv import load_dotenv
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from app.bot.discord_bot import bot
+from app.bot.discord_bot import bot, close_resources
 from app.jobs.stock_tracker_job import StockTrackerJob
+from app.services.content_cache import close_content_cache
+from app.services.http_session import (
+    close_shared_session,
+    get_shared_session
+)
 
 load_dotenv()
 
@@ -19,21 +24,29 @@ logger = logging.getLogger(__name__)
 
 scheduler = AsyncIOScheduler()
 
+# Built once in on_ready and reused by every run, so its HTTP session,
+# scrapers and loaded models carry over between runs
+tracker_job: StockTrackerJob | None = None
+tracker_lock = asyncio.Lock()
+
 
 async def run_stock_tracker():
+    # The startup run can overlap the first scheduled one, and the job
+    # instance is shared
+    if tracker_lock.locked():
+        logger.warning("Stock tracker already running, skipping")
+        return
+
     try:
-        job = StockTrackerJob(
-            newsapi_key=os.getenv("NEWSAPI_KEY"),
-            finnhub_key=os.getenv("FINNHUB_API_KEY"),
-            bot=bot
-        )
-        await job.execute()
+        async with tracker_lock:
+            await tracker_job.execute()
     except Exception as e:
         logger.error(f"Stock tracker error: {e}", exc_info=True)
 
 
 @bot.event
 async def on_ready():
+    global tracker_job
     logger.info(f'{bot.user} connected')
     
     await bot.change_presence(
@@ -41,6 +54,12 @@ async def on_ready():
     )
 
     if not scheduler.running:
+        tracker_job = StockTrackerJob(
+            newsapi_key=os.getenv("NEWSAPI_KEY"),
+            finnhub_key=os.getenv("FINNHUB_API_KEY"),
+            bot=bot,
+            http_session=get_shared_session()
+        )
         scheduler.add_job(
             run_stock_tracker,
             trigger=CronTrigger(hour='8,20', minute='0', timezone='America/New_York'),
@@ -63,6 +82,9 @@ async def main():
         if scheduler.running:
             scheduler.shutdown()
         await bot.close()
+        await close_resources()
+        await close_shared_session()
+        close_content_cache()
 
 
 if __name__ == "__main__":